@@ -4,11 +4,16 @@ Qwen OpenAI-Compatible API Server
 Clean, modular FastAPI application using backend modules
 """
 
+import sys
+from types import ModuleType
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from functools import lru_cache
 
+import httpx
+import orjson
 from fastapi import FastAPI, HTTPException, Header, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from .config_loader import settings
@@ -195,19 +200,15 @@ response = client.chat.completions.create(
     ],
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
-# Initialize Qwen client (singleton)
-qwen_client = None
-
-
+# Initialize Qwen client (singleton; a failed construction is not cached)
+@lru_cache(maxsize=None)
 def get_qwen_client() -> QwenClient:
     """Get or create Qwen client instance"""
-    global qwen_client
-    if qwen_client is None:
-        qwen_client = QwenClient()
-    return qwen_client
+    return QwenClient()
 
 
 @app.on_event("startup")
@@ -226,6 +227,49 @@ async def startup_event():
         raise
 
 
+def _loaded_module(name: str, *aliases: str) -> Optional[ModuleType]:
+    """
+    Return a sibling module if it is already imported, without importing it
+    
+    Args:
+        name: Module name relative to this package
+        *aliases: Absolute names the module may have been imported under instead
+    """
+    for full_name in (f"{__package__}.{name}", *aliases):
+        module = sys.modules.get(full_name)
+        if module is not None:
+            return module
+    return None
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close upstream connections on shutdown"""
+    # Only close a client that was actually created
+    if get_qwen_client.cache_info().currsize:
+        await get_qwen_client().aclose()
+    
+    # Close only what this process actually imported: importing a module here
+    # just to close it could pull in app.* dependencies this server never loads
+    proxy_provider = _loaded_module("qwen_proxy_provider", "app.providers.qwen_proxy_provider")
+    if proxy_provider:
+        await proxy_provider.close_proxy_client()
+    
+    token_compressor = _loaded_module("token_compressor", "app.auth.token_compressor")
+    if token_compressor:
+        await token_compressor.close_validation_client()
+    
+    http_client = _loaded_module("http_client")
+    if http_client:
+        await http_client.close_shared_http_client()
+    
+    # Pooled Chromium first, then the Playwright driver it runs on
+    browser_pool = _loaded_module("browser_pool", "app.auth.browser_pool")
+    if browser_pool:
+        await browser_pool.close_browser_pool()
+        await browser_pool.stop_playwright()
+
+
 @app.get(
     "/",
     tags=["Health"],
@@ -284,12 +328,8 @@ async def list_models():
     **Note**: This endpoint accepts any model name in chat completions.
     Unknown models are automatically mapped to the best Qwen equivalent.
     """
-    models = list_available_models()
-    
-    # Add timestamps
-    timestamp = int(datetime.now().timestamp())
-    for model in models:
-        model["created"] = timestamp
+    # Entries are built with their timestamp in one pass
+    models = list_available_models(created=int(datetime.now().timestamp()))
     
     return {
         "object": "list",
@@ -398,21 +438,41 @@ async def chat_completions(
         
         # Map model name
         mapped_model = map_model_name(request.model)
-        logger.debug(f"Model mapping: '{request.model or 'none'}' → '{mapped_model}'")
+        logger.debug("Model mapping: '%s' → '%s'", request.model or 'none', mapped_model)
         
-        # Normalize request format
-        messages_list = [
-            {"role": msg.role, "content": msg.content}
-            for msg in (request.messages or [])
-        ] if request.messages else None
+        # Normalize request format; validated messages are already in standard
+        # form, so they are converted in a single pass
+        if request.messages:
+            normalized_messages = [
+                {"role": msg.role, "content": msg.content}
+                for msg in request.messages
+            ]
+        else:
+            normalized_messages = normalize_messages(
+                input_text=request.input,
+                prompt=request.prompt
+            )
         
-        normalized_messages = normalize_messages(
-            messages=messages_list,
-            input_text=request.input,
-            prompt=request.prompt
-        )
+        logger.debug("Normalized %d message(s)", len(normalized_messages))
         
-        logger.debug(f"Normalized {len(normalized_messages)} message(s)")
+        # Relay SSE chunks as they arrive instead of buffering the whole stream.
+        # The upstream status is checked before StreamingResponse sends its 200,
+        # so upstream errors still map to a proper HTTP error below.
+        if request.stream:
+            upstream = await client.open_chat_stream(
+                model=mapped_model,
+                messages=normalized_messages,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+                enable_thinking=request.enable_thinking,
+                thinking_budget=request.thinking_budget,
+                tools=request.tools,
+                tool_choice=request.tool_choice
+            )
+            return StreamingResponse(
+                client.iter_chat_stream(upstream),
+                media_type="text/event-stream"
+            )
         
         # Call Qwen API via client
         qwen_response = await client.chat_completion(
@@ -420,7 +480,6 @@ async def chat_completions(
             messages=normalized_messages,
             temperature=request.temperature,
             max_tokens=request.max_tokens,
-            stream=request.stream,
             enable_thinking=request.enable_thinking,
             thinking_budget=request.thinking_budget,
             tools=request.tools,
@@ -457,6 +516,10 @@ async def chat_completions(
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+    except httpx.HTTPStatusError as e:
+        # Pass upstream 401/429/5xx through with their own status code
+        logger.error(f"Qwen API error: {e.response.status_code} {e.response.text}")
+        raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
     except Exception as e:
         logger.error(f"Error processing request: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -472,7 +535,10 @@ async def generic_completions(
     Catch-all for other OpenAI-compatible endpoints
     Redirects to chat completions
     """
-    body = await request.json()
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
     
     # Convert to chat completion format
     if "messages" in body:
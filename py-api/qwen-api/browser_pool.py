@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+
+"""
+Browser Pool - shares one warm Chromium across concurrent Playwright logins
+"""
+
+import asyncio
+import re
+from typing import Optional
+
+from playwright.async_api import Browser, BrowserContext, Playwright, Route, async_playwright
+
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+# Chromium flags that drop GPU, extensions and background services a login never uses
+CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--no-first-run",
+    "--disable-features=TranslateUI",
+]
+
+# Resources the login flow never needs
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+BLOCKED_URL_PATTERN = re.compile(r"google-analytics|googletagmanager|doubleclick|hotjar|sentry|cloudflareinsights")
+
+
+async def block_heavy_resources(route: Route):
+    """Route handler that aborts images, fonts, media and analytics beacons"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PATTERN.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_stylesheets_and_heavy_resources(route: Route):
+    """block_heavy_resources() that also drops stylesheets"""
+    if route.request.resource_type == "stylesheet":
+        await route.abort()
+    else:
+        await block_heavy_resources(route)
+
+
+# 全局Playwright驱动实例（整个进程共享一个Node驱动子进程）
+_playwright: Optional[Playwright] = None
+_playwright_lock: Optional[asyncio.Lock] = None
+
+
+async def get_playwright() -> Playwright:
+    """Return the process-wide Playwright driver, starting it on first use"""
+    global _playwright, _playwright_lock
+    if _playwright_lock is None:
+        _playwright_lock = asyncio.Lock()
+    async with _playwright_lock:
+        if _playwright is None:
+            _playwright = await async_playwright().start()
+            logger.debug("🎭 Playwright driver started")
+        return _playwright
+
+
+async def stop_playwright():
+    """Stop the shared Playwright driver (call on application shutdown)"""
+    global _playwright
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
+
+class BrowserPool:
+    """Lends pre-created browser contexts from a single shared Chromium"""
+
+    def __init__(self, pool_size: int = 4, idle_timeout: float = 300.0, block_stylesheets: bool = False):
+        """
+        Initialize browser pool
+
+        Args:
+            pool_size: Maximum number of contexts lent out at the same time
+            idle_timeout: Seconds without borrowers before Chromium is shut down
+            block_stylesheets: Also abort CSS (some login forms need it to render buttons)
+        """
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.block_stylesheets = block_stylesheets
+
+        self._browser: Optional[Browser] = None
+        self._contexts: asyncio.Queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(pool_size)
+        self._lock = asyncio.Lock()
+        self._in_use = 0
+        self._idle_task: Optional[asyncio.Task] = None
+
+    async def _ensure_browser(self) -> Browser:
+        """Launch Chromium once on the shared Playwright driver, on first use"""
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                playwright = await get_playwright()
+                self._browser = await playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+                logger.info(f"🌐 Browser pool started (size: {self.pool_size})")
+            return self._browser
+
+    async def _new_context(self, browser: Browser, **context_options) -> BrowserContext:
+        """Create a context that skips images, fonts, media and analytics"""
+        context = await browser.new_context(**context_options)
+        handler = block_stylesheets_and_heavy_resources if self.block_stylesheets else block_heavy_resources
+        try:
+            await context.route("**/*", handler)
+        except Exception:
+            await context.close()
+            raise
+        return context
+
+    async def acquire(self, **context_options) -> BrowserContext:
+        """
+        Borrow a browser context, waiting if the pool is exhausted
+
+        Args:
+            **context_options: Browser.new_context() options (user_agent,
+                storage_state, ...); when given, a dedicated context is created
+                instead of taking a pre-created one
+
+        Returns:
+            BrowserContext: Clean context owned by the caller until release()
+        """
+        await self._semaphore.acquire()
+        # Count the borrower up front so an idle close re-checking under the lock sees it
+        self._in_use += 1
+        try:
+            if self._idle_task:
+                self._idle_task.cancel()
+                self._idle_task = None
+
+            browser = await self._ensure_browser()
+            if context_options:
+                return await self._new_context(browser, **context_options)
+
+            context = None
+            while not self._contexts.empty():
+                candidate = self._contexts.get_nowait()
+                if candidate.browser is browser:
+                    context = candidate
+                    break
+            if context is None:
+                context = await self._new_context(browser)
+
+            return context
+        except Exception:
+            self._in_use -= 1
+            self._semaphore.release()
+            raise
+
+    async def release(self, context: BrowserContext):
+        """
+        Return a borrowed context; it is discarded and replaced by a fresh one
+
+        Args:
+            context: Context previously returned by acquire()
+        """
+        try:
+            await context.close()
+            if self._browser and self._browser.is_connected():
+                self._contexts.put_nowait(await self._new_context(self._browser))
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to recycle browser context: {e}")
+        finally:
+            self._in_use -= 1
+            self._semaphore.release()
+
+        if self._in_use == 0:
+            self._idle_task = asyncio.create_task(self._close_when_idle())
+
+    async def _close_when_idle(self):
+        """Shut the browser down after idle_timeout seconds without borrowers"""
+        try:
+            await asyncio.sleep(self.idle_timeout)
+        except asyncio.CancelledError:
+            return
+        # Past this point acquire() must not cancel us mid-close
+        if self._idle_task is asyncio.current_task():
+            self._idle_task = None
+        async with self._lock:
+            # A borrower may have arrived while we waited for the lock
+            if self._in_use == 0:
+                await self._close_locked()
+
+    async def close(self):
+        """Close all pooled contexts and the browser (the shared driver keeps running)"""
+        async with self._lock:
+            await self._close_locked()
+
+    async def _close_locked(self):
+        """close() body; the caller holds self._lock"""
+        while not self._contexts.empty():
+            try:
+                await self._contexts.get_nowait().close()
+            except Exception:
+                pass
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        logger.info("🛑 Browser pool closed")
+
+
+# 全局浏览器池实例
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """获取全局浏览器池实例（首次调用时创建）"""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _browser_pool
+
+
+async def close_browser_pool():
+    """Close the global browser pool (call on application shutdown)"""
+    global _browser_pool
+    if _browser_pool is not None:
+        await _browser_pool.close()
+        _browser_pool = None
@@ -7,17 +7,33 @@ Command-line interface for Qwen API Server
 import argparse
 import os
 import sys
+from dataclasses import dataclass
+from typing import Optional
 
+# Only the tiny version module is imported eagerly; settings, pydantic and the
+# logger are imported inside the functions so --help/--version stay fast
 from app import __version__
-from app.core.config import settings
-from app.utils.logger import get_logger
 
-logger = get_logger()
 
+@dataclass(frozen=True)
+class EnvSnapshot:
+    """Environment variables the CLI reads, captured once after CLI overrides"""
+    flareprox_enabled: bool
+    cloudflare_api_token: Optional[str]
+    cloudflare_account_id: Optional[str]
 
-def print_banner():
-    """Print startup banner"""
-    banner = f"""
+
+def load_env() -> EnvSnapshot:
+    """Read the CLI-relevant environment variables once"""
+    return EnvSnapshot(
+        flareprox_enabled=os.getenv("FLAREPROX_ENABLED", "false").lower() == "true",
+        cloudflare_api_token=os.getenv("CLOUDFLARE_API_TOKEN"),
+        cloudflare_account_id=os.getenv("CLOUDFLARE_ACCOUNT_ID"),
+    )
+
+
+# Startup banner and log separator, formatted once at import
+_BANNER = f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║                                                              ║
 ║   🚀 Qwen API Server v{__version__:<40} ║
@@ -25,7 +41,25 @@ def print_banner():
 ║                                                              ║
 ╚══════════════════════════════════════════════════════════════╝
 """
-    print(banner)
+_SEP = "=" * 70
+
+
+def _lazy_deps():
+    """
+    Import settings and the logger on first use
+
+    Returns:
+        Tuple of (settings, logger)
+    """
+    from app.core.config import settings
+    from app.utils.logger import get_logger
+
+    return settings, get_logger()
+
+
+def print_banner():
+    """Print startup banner"""
+    print(_BANNER)
 
 
 def parse_args() -> argparse.Namespace:
@@ -59,14 +93,14 @@ Environment Variables:
     parser.add_argument(
         "-p", "--port",
         type=int,
-        help=f"Server port (default: {settings.LISTEN_PORT})",
+        help="Server port (default: $LISTEN_PORT or 8080)",
         default=None
     )
 
     parser.add_argument(
         "--host",
         type=str,
-        help=f"Server host (default: {settings.HOST})",
+        help="Server host (default: $HOST or 0.0.0.0)",
         default=None,
         dest="host_arg"
     )
@@ -118,6 +152,7 @@ Environment Variables:
 
 def apply_cli_overrides(args: argparse.Namespace):
     """Apply CLI arguments to settings"""
+    settings, logger = _lazy_deps()
 
     # Port override
     if args.port is not None:
@@ -150,8 +185,9 @@ def apply_cli_overrides(args: argparse.Namespace):
         logger.info(f"📌 Anonymous mode: {'enabled' if args.anonymous else 'disabled'}")
 
 
-def validate_configuration() -> bool:
+def validate_configuration(env: EnvSnapshot) -> bool:
     """Validate configuration before starting server"""
+    settings, logger = _lazy_deps()
     errors = []
 
     # Check port range
@@ -163,11 +199,10 @@ def validate_configuration() -> bool:
         errors.append(f"Tokens file not found: {settings.AUTH_TOKENS_FILE}")
 
     # Check FlareProx configuration
-    flareprox_enabled = os.getenv("FLAREPROX_ENABLED", "false").lower() == "true"
-    if flareprox_enabled:
-        if not os.getenv("CLOUDFLARE_API_TOKEN"):
+    if env.flareprox_enabled:
+        if not env.cloudflare_api_token:
             errors.append("FlareProx enabled but CLOUDFLARE_API_TOKEN not set")
-        if not os.getenv("CLOUDFLARE_ACCOUNT_ID"):
+        if not env.cloudflare_account_id:
             errors.append("FlareProx enabled but CLOUDFLARE_ACCOUNT_ID not set")
 
     if errors:
@@ -179,45 +214,47 @@ def validate_configuration() -> bool:
     return True
 
 
-def print_startup_info():
+def print_startup_info(env: EnvSnapshot):
     """Print startup information"""
-    logger.info("=" * 70)
+    settings, logger = _lazy_deps()
+    logger.info(_SEP)
     logger.info(f"🚀 Starting {settings.SERVICE_NAME}")
     logger.info(f"📡 Server: http://{settings.HOST}:{settings.LISTEN_PORT}")
     logger.info(f"🔧 Debug Mode: {'ON' if settings.DEBUG_LOGGING else 'OFF'}")
     logger.info(f"🔐 Anonymous Mode: {'ON' if settings.ANONYMOUS_MODE else 'OFF'}")
 
     # FlareProx status
-    flareprox_enabled = os.getenv("FLAREPROX_ENABLED", "false").lower() == "true"
-    logger.info(f"🔥 FlareProx: {'ENABLED' if flareprox_enabled else 'DISABLED'}")
+    logger.info(f"🔥 FlareProx: {'ENABLED' if env.flareprox_enabled else 'DISABLED'}")
 
     # Token pool status
     if settings.AUTH_TOKENS_FILE:
         token_count = len(settings.auth_token_list)
         logger.info(f"🎫 Token Pool: {token_count} tokens loaded")
 
-    logger.info("=" * 70)
+    logger.info(_SEP)
 
 
 def main():
     """Main entry point for CLI"""
-    try:
-        # Print banner
-        print_banner()
+    # Print banner
+    print_banner()
 
-        # Parse arguments
-        args = parse_args()
+    # Parse arguments (--help/--version exit here, before the logger is loaded)
+    args = parse_args()
 
+    _, logger = _lazy_deps()
+    try:
         # Apply CLI overrides to settings
         apply_cli_overrides(args)
+        env = load_env()
 
         # Validate configuration
-        if not validate_configuration():
+        if not validate_configuration(env):
             logger.error("❌ Server startup aborted due to configuration errors")
             sys.exit(1)
 
         # Print startup info
-        print_startup_info()
+        print_startup_info(env)
 
         # Import and run server
         from main import run_server
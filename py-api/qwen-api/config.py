@@ -23,6 +23,8 @@ class Settings(BaseSettings):
     QWEN_EMAIL: Optional[str] = None
     QWEN_PASSWORD: Optional[str] = None
     QWEN_BEARER_TOKEN: Optional[str] = None
+    # Set to trust QWEN_BEARER_TOKEN at startup; a 401 on the first call then triggers the Playwright fallback
+    QWEN_SKIP_TOKEN_VALIDATION: bool = False
     
     # FlareProx Configuration (Optional)
     FLAREPROX_ENABLED: bool = False
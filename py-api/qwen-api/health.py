@@ -4,7 +4,10 @@
 Health Check and Monitoring Endpoints
 """
 
+import asyncio
 import time
+from itertools import islice
+from typing import Any, Dict, Optional, Tuple
 
 import psutil
 from fastapi import APIRouter, Response
@@ -22,6 +25,42 @@ router = APIRouter()
 # Track service start time
 _start_time = time.time()
 
+# CPU使用率按两次采样间的差值计算，导入时先预热一次
+psutil.cpu_percent(interval=None)
+
+# 系统资源快照缓存（采样时间, 数据），1秒内的请求共享同一份
+_SYSTEM_SAMPLE_TTL = 1.0
+_system_sample: Optional[Tuple[float, Dict[str, Any]]] = None
+
+# Prometheus text format, encoded once; %d counters, %r gauges (same digits as str())
+_METRICS_TEMPLATE = b"""# HELP qwen_api_requests_total Total number of requests processed
+# TYPE qwen_api_requests_total counter
+qwen_api_requests_total %d
+
+# HELP qwen_api_requests_active Currently active requests
+# TYPE qwen_api_requests_active gauge
+qwen_api_requests_active %d
+
+# HELP qwen_api_requests_successful Successfully completed requests
+# TYPE qwen_api_requests_successful counter
+qwen_api_requests_successful %d
+
+# HELP qwen_api_requests_failed Failed requests
+# TYPE qwen_api_requests_failed counter
+qwen_api_requests_failed %d
+
+# HELP qwen_api_requests_timeout Timed out requests
+# TYPE qwen_api_requests_timeout counter
+qwen_api_requests_timeout %d
+
+# HELP qwen_api_success_rate Request success rate percentage
+# TYPE qwen_api_success_rate gauge
+qwen_api_success_rate %r
+
+# HELP qwen_api_uptime_seconds Service uptime in seconds
+# TYPE qwen_api_uptime_seconds gauge
+qwen_api_uptime_seconds %r"""
+
 
 @router.get("/health")
 async def health_check():
@@ -43,6 +82,7 @@ async def detailed_health():
     flareprox_manager = get_flareprox_manager()
     request_tracker = get_request_tracker()
     token_pool = get_token_pool()
+    total_tokens, available_tokens = token_pool.get_counts() if token_pool else (0, 0)
 
     health_status = {
         "status": "healthy",
@@ -61,9 +101,9 @@ async def detailed_health():
                 "status": "healthy"
             },
             "token_pool": {
-                "total_tokens": len(token_pool._tokens) if token_pool else 0,
-                "available_tokens": len([t for t in (token_pool._tokens if token_pool else []) if t.is_available]),
-                "status": "healthy" if token_pool and any(t.is_available for t in token_pool._tokens) else "degraded"
+                "total_tokens": total_tokens,
+                "available_tokens": available_tokens,
+                "status": "healthy" if available_tokens else "degraded"
             }
         }
     }
@@ -79,16 +119,20 @@ async def detailed_health():
 
 
 @router.get("/stats")
-async def get_stats():
+async def get_stats(limit: int = 100):
     """
     Get service statistics
 
+    Args:
+        limit: Maximum number of per-token entries in token_stats
+
     Returns:
         Statistics for request tracking, FlareProx, token pool
     """
     flareprox_manager = get_flareprox_manager()
     request_tracker = get_request_tracker()
     token_pool = get_token_pool()
+    total_tokens, available_tokens = token_pool.get_counts() if token_pool else (0, 0)
 
     stats = {
         "service": {
@@ -99,16 +143,16 @@ async def get_stats():
         "request_tracker": request_tracker.get_stats(),
         "flareprox": flareprox_manager.get_stats(),
         "token_pool": {
-            "total_tokens": len(token_pool._tokens) if token_pool else 0,
-            "available_tokens": len([t for t in (token_pool._tokens if token_pool else []) if t.is_available]),
+            "total_tokens": total_tokens,
+            "available_tokens": available_tokens,
             "token_stats": [
                 {
                     "token": t.token[:10] + "..." if len(t.token) > 10 else t.token,
                     "available": t.is_available,
                     "failure_count": t.failure_count,
-                    "last_used": t.last_used
+                    "last_used": max(t.last_success_time, t.last_failure_time)
                 }
-                for t in (token_pool._tokens if token_pool else [])
+                for t in islice(token_pool.token_statuses.values(), max(limit, 0))
             ]
         } if token_pool else {}
     }
@@ -116,15 +160,10 @@ async def get_stats():
     return stats
 
 
-@router.get("/system")
-async def get_system_info():
-    """
-    Get system resource information
-
-    Returns:
-        CPU, memory, disk usage
-    """
-    cpu_percent = psutil.cpu_percent(interval=1)
+def _sample_system() -> Dict[str, Any]:
+    """Collect CPU, memory and disk usage (blocking psutil calls, run in a worker thread)"""
+    # Usage since the previous sample, so no blocking 1-second measurement window
+    cpu_percent = psutil.cpu_percent(interval=None)
     memory = psutil.virtual_memory()
     disk = psutil.disk_usage('/')
 
@@ -148,6 +187,27 @@ async def get_system_info():
     }
 
 
+@router.get("/system")
+async def get_system_info():
+    """
+    Get system resource information
+
+    Sampled at most once per second, off the event loop.
+
+    Returns:
+        CPU, memory, disk usage
+    """
+    global _system_sample
+    now = time.monotonic()
+    if _system_sample is None or now - _system_sample[0] >= _SYSTEM_SAMPLE_TTL:
+        _system_sample = (now, await asyncio.to_thread(_sample_system))
+    return _system_sample[1]
+
+
+# Prometheus text exposition format content type
+_METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
 @router.get("/metrics")
 async def get_metrics():
     """
@@ -158,38 +218,18 @@ async def get_metrics():
     request_tracker = get_request_tracker()
     stats = request_tracker.get_stats()
 
-    # Simple text format metrics
-    metrics_text = f"""
-# HELP qwen_api_requests_total Total number of requests processed
-# TYPE qwen_api_requests_total counter
-qwen_api_requests_total {stats['total_requests']}
-
-# HELP qwen_api_requests_active Currently active requests
-# TYPE qwen_api_requests_active gauge
-qwen_api_requests_active {stats['active_requests']}
-
-# HELP qwen_api_requests_successful Successfully completed requests
-# TYPE qwen_api_requests_successful counter
-qwen_api_requests_successful {stats['successful_requests']}
-
-# HELP qwen_api_requests_failed Failed requests
-# TYPE qwen_api_requests_failed counter
-qwen_api_requests_failed {stats['failed_requests']}
-
-# HELP qwen_api_requests_timeout Timed out requests
-# TYPE qwen_api_requests_timeout counter
-qwen_api_requests_timeout {stats['timeout_requests']}
-
-# HELP qwen_api_success_rate Request success rate percentage
-# TYPE qwen_api_success_rate gauge
-qwen_api_success_rate {stats['success_rate']}
-
-# HELP qwen_api_uptime_seconds Service uptime in seconds
-# TYPE qwen_api_uptime_seconds gauge
-qwen_api_uptime_seconds {time.time() - _start_time}
-    """.strip()
-
-    return Response(content=metrics_text, media_type="text/plain")
+    # Only the values are formatted per scrape; the HELP/TYPE text is prebuilt
+    metrics_body = _METRICS_TEMPLATE % (
+        stats['total_requests'],
+        stats['active_requests'],
+        stats['successful_requests'],
+        stats['failed_requests'],
+        stats['timeout_requests'],
+        stats['success_rate'],
+        time.time() - _start_time,
+    )
+
+    return Response(content=metrics_body, media_type=_METRICS_CONTENT_TYPE)
 
 
 @router.get("/debug")
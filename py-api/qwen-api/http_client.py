@@ -8,15 +8,17 @@ Features:
 - Request correlation tracking
 - Retry logic with exponential backoff
 - Streaming response support
-- Connection pooling
+- Connection pooling (HTTP/2)
 - Error handling and recovery
 """
 
 import asyncio
+import random
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
 
 import httpx
+import orjson
 
 from app.utils.flareprox_manager import get_flareprox_manager
 from app.utils.logger import get_logger
@@ -37,12 +39,16 @@ class ProxiedHTTPClient:
     - Connection pooling for performance
     """
 
+    # Upper bound for a single retry sleep (seconds)
+    MAX_RETRY_DELAY = 30.0
+
     def __init__(
         self,
         timeout: float = 30.0,
         max_retries: int = 3,
         retry_delay: float = 1.0,
         follow_redirects: bool = True,
+        max_concurrency: int = 200,
         **httpx_kwargs
     ):
         """
@@ -53,6 +59,7 @@ class ProxiedHTTPClient:
             max_retries: Maximum number of retry attempts
             retry_delay: Base delay between retries (exponential backoff)
             follow_redirects: Whether to follow HTTP redirects
+            max_concurrency: Maximum in-flight requests (matches the connection pool)
             **httpx_kwargs: Additional arguments passed to httpx.AsyncClient
         """
         self.timeout = timeout
@@ -63,30 +70,63 @@ class ProxiedHTTPClient:
         self.flareprox_manager = get_flareprox_manager()
         self.request_tracker = get_request_tracker()
 
-        # HTTP client configuration
+        # HTTP client configuration (HTTP/2 multiplexes concurrent requests
+        # over one connection; keepalive == max so idle sockets aren't evicted)
         self._client_config = {
             "timeout": httpx.Timeout(timeout),
             "follow_redirects": follow_redirects,
+            "http2": True,
             "limits": httpx.Limits(
-                max_keepalive_connections=50,
-                max_connections=100,
-                keepalive_expiry=30.0
+                max_keepalive_connections=max_concurrency,
+                max_connections=max_concurrency,
+                keepalive_expiry=120.0
             ),
             **httpx_kwargs
         }
 
         self._client: Optional[httpx.AsyncClient] = None
 
+        # Caps in-flight requests at pool capacity so bursts wait for a slot
+        # instead of thrashing the pool (retry backoff does not hold a slot)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        """Open the underlying httpx client on first use (no await, so no lock needed)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(**self._client_config)
+        return self._client
+
+    async def aclose(self):
+        """Close the underlying httpx client; the next request reopens it"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
     async def __aenter__(self):
         """Async context manager entry"""
-        self._client = httpx.AsyncClient(**self._client_config)
+        self._ensure_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        await self.aclose()
+
+    @classmethod
+    def _parse_retry_after(cls, response: httpx.Response) -> Optional[float]:
+        """
+        Read a Retry-After header given in seconds
+
+        Returns:
+            Delay in seconds (capped at MAX_RETRY_DELAY), or None if absent/unparseable
+        """
+        value = response.headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return min(max(float(value), 0.0), cls.MAX_RETRY_DELAY)
+        except ValueError:
+            # HTTP-date form is not worth parsing for a retry hint
+            return None
 
     def _get_proxied_url(self, url: str) -> tuple[str, Optional[str]]:
         """
@@ -120,12 +160,20 @@ class ProxiedHTTPClient:
         Raises:
             httpx.HTTPError: If all retries fail
         """
-        if not self._client:
-            raise RuntimeError("HTTP client not initialized. Use async context manager.")
+        client = self._ensure_client()
+
+        # Encode a JSON body once, not once per attempt inside httpx
+        if "json" in kwargs:
+            kwargs["content"] = orjson.dumps(kwargs.pop("json"))
+            headers = httpx.Headers(kwargs.get("headers"))
+            if "content-type" not in headers:
+                headers["Content-Type"] = "application/json"
+            kwargs["headers"] = headers
 
         last_error = None
 
         for attempt in range(self.max_retries):
+            retry_after = None
             try:
                 # Get proxied URL
                 proxied_url, proxy_url = self._get_proxied_url(url)
@@ -144,18 +192,19 @@ class ProxiedHTTPClient:
                     )
 
                     # Make request
-                    response = await self._client.request(
-                        method=method,
-                        url=proxied_url,
-                        **kwargs
-                    )
+                    async with self._semaphore:
+                        response = await client.request(
+                            method=method,
+                            url=proxied_url,
+                            **kwargs
+                        )
 
                     # Check response status
                     response.raise_for_status()
 
                     logger.debug(
                         f"✅ {method} {url} -> {response.status_code} "
-                        f"[{context.request_id}]"
+                        f"{response.http_version} [{context.request_id}]"
                     )
 
                     return response
@@ -167,10 +216,13 @@ class ProxiedHTTPClient:
                     f"(attempt {attempt + 1}/{self.max_retries})"
                 )
 
-                # Don't retry on 4xx errors (client errors)
-                if 400 <= e.response.status_code < 500:
+                # Don't retry on 4xx errors (client errors), except 429 rate limits
+                status = e.response.status_code
+                if 400 <= status < 500 and status != 429:
                     raise
 
+                retry_after = self._parse_retry_after(e.response)
+
                 # Rotate proxy on server errors
                 if self.flareprox_manager.enabled:
                     self.flareprox_manager.proxies.rotate(-1)
@@ -193,9 +245,13 @@ class ProxiedHTTPClient:
                     f"(attempt {attempt + 1}/{self.max_retries})"
                 )
 
-            # Exponential backoff before retry
+            # Full-jitter exponential backoff before retry, so concurrent callers
+            # don't retry in lockstep; an upstream Retry-After takes precedence
             if attempt < self.max_retries - 1:
-                delay = self.retry_delay * (2 ** attempt)
+                if retry_after is not None:
+                    delay = retry_after
+                else:
+                    delay = random.uniform(0, min(self.retry_delay * (1 << attempt), self.MAX_RETRY_DELAY))
                 logger.debug(f"⏳ Retrying in {delay:.1f}s...")
                 await asyncio.sleep(delay)
 
@@ -238,8 +294,7 @@ class ProxiedHTTPClient:
         Yields:
             Response data chunks
         """
-        if not self._client:
-            raise RuntimeError("HTTP client not initialized. Use async context manager.")
+        client = self._ensure_client()
 
         # Get proxied URL
         proxied_url, proxy_url = self._get_proxied_url(url)
@@ -254,7 +309,7 @@ class ProxiedHTTPClient:
             logger.debug(f"🌊 Streaming {method} {url} [{context.request_id}]")
 
             try:
-                async with self._client.stream(
+                async with client.stream(
                     method=method,
                     url=proxied_url,
                     **kwargs
@@ -285,6 +340,26 @@ async def get_http_client(**kwargs) -> ProxiedHTTPClient:
         yield client
 
 
+# 全局共享客户端实例（一次性请求复用同一连接池，不再每次握手）
+_shared_client: Optional[ProxiedHTTPClient] = None
+
+
+def _get_shared_client() -> ProxiedHTTPClient:
+    """Return the process-wide ProxiedHTTPClient (it opens its connection pool on first request)"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = ProxiedHTTPClient()
+    return _shared_client
+
+
+async def close_shared_http_client():
+    """Close the shared client used by request()/get()/post() (call on application shutdown)"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+
 # Convenience function for one-off requests
 async def request(
     method: str,
@@ -295,6 +370,8 @@ async def request(
     """
     Make a one-off HTTP request with FlareProx support
 
+    Requests share one pooled client; use get_http_client() for a scoped one.
+
     Args:
         method: HTTP method
         url: Target URL
@@ -304,8 +381,7 @@ async def request(
     Returns:
         HTTP response
     """
-    async with get_http_client(timeout=timeout) as client:
-        return await client._make_request_with_retry(method, url, **kwargs)
+    return await _get_shared_client()._make_request_with_retry(method, url, timeout=timeout, **kwargs)
 
 
 # Convenience functions for common HTTP methods
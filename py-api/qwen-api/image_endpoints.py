@@ -8,7 +8,7 @@ OpenAI-compatible API endpoints for Qwen image/video generation
 from typing import Optional
 
 from fastapi import APIRouter, Header, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
@@ -87,7 +87,7 @@ async def generate_images(request: ImageGenerationRequest, authorization: str =
         )
 
         logger.info("✅ Image generation successful")
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
 
     except HTTPException:
         raise
@@ -135,7 +135,7 @@ async def edit_images(request: ImageEditRequest, authorization: str = Header(...
         )
 
         logger.info("✅ Image editing successful")
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
 
     except HTTPException:
         raise
@@ -181,7 +181,7 @@ async def generate_videos(request: VideoGenerationRequest, authorization: str =
         )
 
         logger.info("✅ Video generation successful")
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
 
     except HTTPException:
         raise
@@ -233,7 +233,7 @@ async def deep_research(request: DeepResearchRequest, authorization: str = Heade
         )
 
         logger.info("✅ Deep research successful")
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
 
     except HTTPException:
         raise
@@ -4,6 +4,7 @@ Model Name Mapper
 Maps any model name to valid Qwen models
 """
 
+from functools import lru_cache
 from typing import Optional
 from .config_loader import settings
 from .logging_config import logger
@@ -33,6 +34,20 @@ VALID_QWEN_MODELS = {
 }
 
 
+@lru_cache(maxsize=512)
+def _lookup_model(model: str) -> Optional[str]:
+    """
+    Resolve a raw model name against the registry, memoized per raw string.
+    
+    Clients send the same handful of names, so normalization runs once per
+    spelling. Unknown names resolve to None, keeping the default model a
+    runtime setting rather than a cached value.
+    """
+    # Normalize model name (lowercase, remove spaces)
+    normalized = model.lower().strip().replace(" ", "-")
+    return VALID_QWEN_MODELS.get(normalized)
+
+
 def map_model_name(model: Optional[str]) -> str:
     """
     Map any model name to a valid Qwen model.
@@ -46,45 +61,45 @@ def map_model_name(model: Optional[str]) -> str:
     if not model:
         return settings.default_model
     
-    # Normalize model name (lowercase, remove spaces)
-    normalized = model.lower().strip().replace(" ", "-")
+    # Canonical names (the common case) hit the registry without normalizing
+    mapped = VALID_QWEN_MODELS.get(model)
+    if mapped is not None:
+        return mapped
     
-    # Check if it's a known Qwen model
-    if normalized in VALID_QWEN_MODELS:
-        return VALID_QWEN_MODELS[normalized]
+    # Check if it's a known Qwen model under another spelling
+    mapped = _lookup_model(model)
+    if mapped is not None:
+        return mapped
     
     # Default fallback
-    logger.debug(f"Unknown model '{model}', using default: {settings.default_model}")
+    logger.debug("Unknown model '%s', using default: %s", model, settings.default_model)
     return settings.default_model
 
 
-def list_available_models() -> list:
-    """Return list of available models for /v1/models endpoint"""
+# Models advertised by /v1/models
+AVAILABLE_MODEL_IDS = (
+    "qwen3-max",
+    "qwen3-vl-plus",
+    "qwen3-coder-plus",
+    "qwen2.5-72b-instruct",
+    "qwen2.5-coder-32b-instruct",
+)
+
+
+def list_available_models(created: Optional[int] = None) -> list:
+    """
+    Return list of available models for /v1/models endpoint
+    
+    Args:
+        created: Optional timestamp stamped on every entry
+        
+    Returns:
+        Fresh list of model dicts (safe for the caller to mutate)
+    """
+    if created is None:
+        return [{"id": model_id, "object": "model", "owned_by": "qwen"} for model_id in AVAILABLE_MODEL_IDS]
     return [
-        {
-            "id": "qwen3-max",
-            "object": "model",
-            "owned_by": "qwen"
-        },
-        {
-            "id": "qwen3-vl-plus",
-            "object": "model",
-            "owned_by": "qwen"
-        },
-        {
-            "id": "qwen3-coder-plus",
-            "object": "model",
-            "owned_by": "qwen"
-        },
-        {
-            "id": "qwen2.5-72b-instruct",
-            "object": "model",
-            "owned_by": "qwen"
-        },
-        {
-            "id": "qwen2.5-coder-32b-instruct",
-            "object": "model",
-            "owned_by": "qwen"
-        },
+        {"id": model_id, "object": "model", "created": created, "owned_by": "qwen"}
+        for model_id in AVAILABLE_MODEL_IDS
     ]
 
@@ -6,7 +6,7 @@ import jwt
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Header, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from app.core.config import settings
 from app.models.schemas import (
@@ -70,7 +70,7 @@ def create_chunk(chat_id: str, model: str, delta: Dict[str, Any], finish_reason:
     }
 
 
-async def handle_non_stream_response(stream_response, request: OpenAIRequest) -> JSONResponse:
+async def handle_non_stream_response(stream_response, request: OpenAIRequest) -> ORJSONResponse:
     """处理非流式响应"""
     logger.info("📄 开始处理非流式响应")
 
@@ -114,7 +114,7 @@ async def handle_non_stream_response(stream_response, request: OpenAIRequest) ->
     )
 
     logger.info("✅ 非流式响应处理完成")
-    return JSONResponse(content=response_data.model_dump(exclude_none=True))
+    return ORJSONResponse(content=response_data.model_dump(exclude_none=True))
 
 
 @router.get("/v1/models")
@@ -123,7 +123,7 @@ async def list_models():
     try:
         router_instance = get_provider_router_instance()
         models_data = router_instance.get_models_list()
-        return JSONResponse(content=models_data)
+        return ORJSONResponse(content=models_data)
     except Exception as e:
         logger.error(f"❌ 获取模型列表失败: {e}")
         # 返回默认模型列表作为后备
@@ -190,7 +190,7 @@ async def chat_completions(request: OpenAIRequest, authorization: str = Header(.
         else:
             # 非流式响应
             if isinstance(result, dict):
-                return JSONResponse(content=result)
+                return ORJSONResponse(content=result)
             else:
                 # 如果是异步生成器，需要收集所有内容
                 return await handle_non_stream_response(result, request)
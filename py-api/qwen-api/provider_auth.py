@@ -9,10 +9,12 @@ Enhanced to support both manual Bearer tokens and automated Playwright login
 """
 
 import asyncio
+import time
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 
-from app.auth.session_store import SessionStore
+from app.auth.session_store import SessionStore, _token_expiry
+from app.auth.token_compressor import validate_compressed_token
 from app.utils.logger import get_logger
 
 logger = get_logger()
@@ -21,6 +23,10 @@ logger = get_logger()
 class ProviderAuth(ABC):
     """Base class for provider authentication"""
 
+    # Seconds to wait after a failed login, doubled per consecutive failure up to the max
+    LOGIN_FAILURE_BACKOFF = 30.0
+    LOGIN_FAILURE_BACKOFF_MAX = 300.0
+
     def __init__(self, config: Dict[str, str]):
         """
         Initialize provider authentication
@@ -42,6 +48,14 @@ class ProviderAuth(ABC):
         self._cached_cookies: Optional[Dict[str, str]] = None
         self._cached_token: Optional[str] = None
 
+        # In-flight login shared by concurrent callers (single-flight)
+        self._login_lock = asyncio.Lock()
+        self._login_task: Optional[asyncio.Task] = None
+
+        # Negative cache: after a failed login, skip new attempts for a backoff window
+        self._last_login_failure: Optional[float] = None
+        self._failure_backoff: float = 0
+
     @abstractmethod
     async def login(self) -> Dict[str, Any]:
         """
@@ -70,8 +84,8 @@ class ProviderAuth(ABC):
             }
 
         # Try to load from storage
-        if not force_refresh and self.session_store.is_valid(max_age=43200):  # 12 hours
-            session = self.session_store.load_session()
+        if not force_refresh:
+            session = await self.session_store.load_valid_session_async(max_age=43200)  # 12 hours
             if session:
                 self._cached_cookies = session.get("cookies")
                 self._cached_token = session.get("token")
@@ -81,7 +95,29 @@ class ProviderAuth(ABC):
                     "token": self._cached_token
                 }
 
-        # Need to login
+        # A recent failure means the next login would most likely fail too
+        if self._last_login_failure is not None:
+            remaining = self._failure_backoff - (time.monotonic() - self._last_login_failure)
+            if remaining > 0:
+                logger.debug(f"⏳ {self.name} login backing off for {remaining:.0f}s")
+                return None
+
+        # Need to login - concurrent callers wait on the same login instead of starting their own
+        async with self._login_lock:
+            task = self._login_task
+            if task is None:
+                task = self._login_task = asyncio.create_task(self._login_and_cache())
+                task.add_done_callback(self._clear_login_task)
+        # shield: a cancelled caller must not cancel the login other callers are waiting on
+        return await asyncio.shield(task)
+
+    def _clear_login_task(self, task: asyncio.Task):
+        """Forget the finished login so the next miss starts a new one"""
+        if self._login_task is task:
+            self._login_task = None
+
+    async def _login_and_cache(self) -> Optional[Dict[str, Any]]:
+        """Run login(), cache and persist the result"""
         logger.info(f"🔐 Logging in to {self.name}...")
         try:
             auth_data = await self.login()
@@ -91,12 +127,15 @@ class ProviderAuth(ABC):
             self._cached_token = auth_data.get("token")
 
             # Save to storage
-            self.session_store.save_session(
+            await self.session_store.save_session_async(
                 self._cached_cookies,
                 self._cached_token,
                 auth_data.get("extra")
             )
 
+            self._last_login_failure = None
+            self._failure_backoff = 0
+
             logger.info(f"✅ {self.name} login successful")
             return {
                 "cookies": self._cached_cookies,
@@ -104,7 +143,10 @@ class ProviderAuth(ABC):
             }
 
         except Exception as e:
-            logger.error(f"❌ {self.name} login failed: {e}")
+            # Exponential backoff so a bad credential or outage does not trigger a retry storm
+            self._last_login_failure = time.monotonic()
+            self._failure_backoff = min(self._failure_backoff * 2 or self.LOGIN_FAILURE_BACKOFF, self.LOGIN_FAILURE_BACKOFF_MAX)
+            logger.error(f"❌ {self.name} login failed: {e} (retry in {self._failure_backoff:.0f}s)")
             return None
 
     async def get_cookies(self, force_refresh: bool = False) -> Optional[Dict[str, str]]:
@@ -139,6 +181,41 @@ class QwenAuth(ProviderAuth):
       - Caches compressed token for reuse
     """
     
+    # Only cookies scoped to these URLs are kept (skips analytics/CDN cookies)
+    COOKIE_URLS = ["https://chat.qwen.ai", "https://qwen.ai"]
+    
+    # localStorage token lookup, built once instead of per call
+    _JS_GET_WEB_API_TOKEN = '''() => {
+        // Qwen stores token under 'web_api_token' key (verified 2025-10-14)
+        // Check correct key first, then fallbacks
+        return localStorage.getItem('web_api_token')
+            || localStorage.getItem('token') 
+            || localStorage.getItem('web_api_auth_token')
+            || localStorage.getItem('access_token')
+            || localStorage.getItem('auth_token');
+    }'''
+    
+    # Fills both inputs and clicks submit in one CDP round-trip; the native value
+    # setter + input/change events keep React-controlled inputs in sync
+    _JS_FILL_AND_SUBMIT = '''([email, password]) => {
+        const emailInput = document.querySelector('input[type="email"], input[type="text"], input[name="email"]');
+        const passwordInput = document.querySelector('input[type="password"], input[name="password"]');
+        const submit = document.querySelector('button[type="submit"]')
+            || Array.from(document.querySelectorAll('button'))
+                .find(b => /登录|Login|Log in/.test(b.textContent));
+        if (!emailInput || !passwordInput || !submit) {
+            return false;
+        }
+        const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+        for (const [input, value] of [[emailInput, email], [passwordInput, password]]) {
+            setValue.call(input, value);
+            input.dispatchEvent(new Event('input', { bubbles: true }));
+            input.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+        submit.click();
+        return true;
+    }'''
+    
     def __init__(self, config: Dict[str, str]):
         """
         Initialize Qwen authentication
@@ -151,10 +228,12 @@ class QwenAuth(ProviderAuth):
         # Check for pre-compressed token
         self.bearer_token = config.get("bearer_token") or config.get("token")
         
-        # Log authentication mode
-        if self.bearer_token:
+        # A valid manual token never touches Playwright, so it need not be installed
+        if self.bearer_token and validate_compressed_token(self.bearer_token):
+            self._login_mode = "manual"
             logger.info("🔑 Qwen: Bearer token provided (manual mode)")
         else:
+            self._login_mode = "auto"
             logger.info("🌐 Qwen: Will use Playwright automation (auto mode)")
     
     async def login(self) -> Dict[str, Any]:
@@ -169,22 +248,16 @@ class QwenAuth(ProviderAuth):
         Returns:
             Dict with cookies and Bearer token
         """
-        from app.auth.token_compressor import validate_compressed_token
-        
-        # Mode 1: Use provided Bearer token
-        if self.bearer_token:
+        # Mode 1: Use provided Bearer token (validated once in __init__)
+        if self._login_mode == "manual":
             logger.info("🔑 Using provided QWEN_BEARER_TOKEN")
-            
-            # Validate token format
-            if validate_compressed_token(self.bearer_token):
-                logger.info("✅ Token validated successfully")
-                return {
-                    "cookies": {},  # Not needed when using Bearer token
-                    "token": self.bearer_token,
-                    "extra": {"method": "bearer_token"}
-                }
-            else:
-                logger.warning("⚠️ Provided token appears invalid, falling back to login")
+            return {
+                "cookies": {},  # Not needed when using Bearer token
+                "token": self.bearer_token,
+                "extra": {"method": "bearer_token"}
+            }
+        if self.bearer_token:
+            logger.warning("⚠️ Provided token appears invalid, falling back to login")
         
         # Mode 2: Playwright automation
         logger.info("🌐 Starting Playwright authentication")
@@ -195,145 +268,184 @@ class QwenAuth(ProviderAuth):
         Login to Qwen using Playwright and create compressed Bearer token.
         
         Steps:
-        1. Navigate to Qwen chat
-        2. Fill in credentials
+        1. Navigate to Qwen chat (restoring the last saved storage_state)
+        2. Fill in credentials, unless the restored session is already logged in
         3. Extract 'token' from localStorage (raw Bearer token)
         4. Extract cookies for additional auth context
         5. Return raw token (no compression needed)
+        
+        Raises:
+            RuntimeError: If Playwright is not installed
         """
-        from playwright.async_api import async_playwright
+        try:
+            from app.auth.browser_pool import get_browser_pool
+        except ImportError as e:
+            raise RuntimeError(
+                "playwright not installed - set QWEN_BEARER_TOKEN or install 'qwen-api[playwright]'"
+            ) from e
+
+        storage_state = await self.session_store.load_storage_state_async()
+
+        # Borrow from the shared pool so its idle timeout shuts Chromium down between logins
+        pool = get_browser_pool()
+        context = await pool.acquire(
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36',
+            viewport={"width": 1280, "height": 800},
+            storage_state=storage_state
+        )
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36'
-            )
+        try:
             page = await context.new_page()
 
-            try:
-                logger.info(f"🌐 Qwen: Navigating to {self.base_url}")
-                await page.goto(self.base_url, wait_until='networkidle', timeout=30000)
-
-                # Click "Log in" button to go to login page
-                try:
-                    logger.debug("🔍 Qwen: Looking for 'Log in' button")
-                    login_link = await page.wait_for_selector(
-                        'button:has-text("Log in"), button:has-text("登录"), a:has-text("Log in"), a:has-text("登录")',
-                        timeout=5000
-                    )
-                    await login_link.click()
-                    logger.info("👆 Qwen: Clicked 'Log in' button")
-                    await page.wait_for_load_state('networkidle', timeout=10000)
-                except Exception as e:
-                    logger.debug(f"Qwen: Could not find/click login button: {e}, assuming already on login page")
-
-                # Wait for login form
-                logger.debug("🔐 Qwen: Waiting for login form")
-                await page.wait_for_selector('input[type="email"], input[type="text"], input[name="email"]', timeout=10000)
-
-                # Fill in credentials
-                logger.debug("✏️ Qwen: Filling credentials")
-                email_input = await page.query_selector('input[type="email"], input[type="text"], input[name="email"]')
-                await email_input.fill(self.email)
-
-                password_input = await page.query_selector('input[type="password"], input[name="password"]')
-                await password_input.fill(self.password)
-
-                # Click login button
-                logger.debug("👆 Qwen: Clicking login button")
-                submit_button = await page.query_selector('button[type="submit"], button:has-text("登录"), button:has-text("Login")')
-                await submit_button.click()
-
-                # Wait for successful login
-                logger.debug("⏳ Qwen: Waiting for login to complete")
-                try:
-                    await page.wait_for_url('**/chat**', timeout=20000)
-                    logger.info("✅ Qwen: Login successful (URL changed)")
-                except:
-                    try:
-                        await page.wait_for_load_state('networkidle', timeout=20000)
-                        logger.info("✅ Qwen: Login successful (network idle)")
-                    except:
-                        logger.warning("⚠️ Qwen: Timeout waiting for login, checking token anyway")
-
-                # Extract localStorage token with retries
-                logger.debug("🔑 Qwen: Extracting localStorage token")
-                web_api_token = None
-
-                # Wait longer after login for token to be set
-                await asyncio.sleep(3)
-                
-                for attempt in range(10):
-                    web_api_token = await page.evaluate('''() => {
-                        // Qwen stores token under 'web_api_token' key (verified 2025-10-14)
-                        // Check correct key first, then fallbacks
-                        return localStorage.getItem('web_api_token')
-                            || localStorage.getItem('token') 
-                            || localStorage.getItem('web_api_auth_token')
-                            || localStorage.getItem('access_token')
-                            || localStorage.getItem('auth_token');
-                    }''')
-                    if web_api_token:
-                        logger.info(f"✅ Qwen: Found web_api_token on attempt {attempt + 1}")
-                        break
-                    logger.debug(f"⏳ Qwen: Attempt {attempt + 1}/10 - waiting for token...")
-                    await asyncio.sleep(2)
-
-                # Extract cookies
-                logger.debug("🍪 Qwen: Extracting cookies")
-                cookies = await context.cookies()
-
-                # Find ssxmod_itna cookie
-                ssxmod_itna = None
-                cookie_dict = {}
-                for cookie in cookies:
-                    cookie_dict[cookie['name']] = cookie['value']
-                    if cookie['name'] == 'ssxmod_itna':
-                        ssxmod_itna = cookie['value']
-
-                logger.info(f"📊 Qwen: web_api_token={bool(web_api_token)}, ssxmod_itna={bool(ssxmod_itna)}, total_cookies={len(cookie_dict)}")
-
-                # Use RAW token directly (as per Qwen API documentation)
-                # No compression needed - just use the localStorage 'token' value
-                bearer_token = None
+            logger.info(f"🌐 Qwen: Navigating to {self.base_url}")
+            await page.goto(self.base_url, wait_until='domcontentloaded', timeout=30000)
+
+            web_api_token = None
+            if storage_state:
+                # A restored session may already be logged in - skip the credential flow
+                web_api_token, cookies = await asyncio.gather(
+                    page.evaluate(self._JS_GET_WEB_API_TOKEN),
+                    self._extract_cookies(context)
+                )
+                # An expired token would just be saved and rejected again - log in afresh
+                expires_at = _token_expiry(web_api_token)
+                if expires_at is not None and expires_at <= time.time():
+                    logger.info("⏰ Qwen: Restored session token expired, logging in again")
+                    web_api_token = None
                 if web_api_token:
-                    bearer_token = web_api_token
-                    logger.info(f"✅ Qwen: Using raw Bearer token ({len(bearer_token)} chars)")
-                    logger.debug(f"🔑 Token format: {bearer_token[:20]}...{bearer_token[-20:]}")
-                else:
-                    logger.warning("⚠️ Qwen: Missing Bearer token")
-                    logger.error("❌ Qwen: Token not found in localStorage (checked: web_api_token, token, web_api_auth_token, access_token, auth_token)")
+                    logger.info("✅ Qwen: Restored logged-in session from storage state")
+
+            if not web_api_token:
+                await self._submit_credentials(page)
+                await self._wait_for_web_api_token(page)
+                # Token and cookies are independent CDP round-trips
+                web_api_token, cookies = await asyncio.gather(
+                    page.evaluate(self._JS_GET_WEB_API_TOKEN),
+                    self._extract_cookies(context)
+                )
+
+            # Find ssxmod_itna cookie
+            cookie_dict = {cookie['name']: cookie['value'] for cookie in cookies}
+            ssxmod_itna = cookie_dict.get('ssxmod_itna')
+
+            logger.info(f"📊 Qwen: web_api_token={bool(web_api_token)}, ssxmod_itna={bool(ssxmod_itna)}, total_cookies={len(cookie_dict)}")
+
+            # Use RAW token directly (as per Qwen API documentation)
+            # No compression needed - just use the localStorage 'token' value
+            bearer_token = None
+            if web_api_token:
+                bearer_token = web_api_token
+                logger.info(f"✅ Qwen: Using raw Bearer token ({len(bearer_token)} chars)")
+                logger.debug(f"🔑 Token format: {bearer_token[:20]}...{bearer_token[-20:]}")
+            else:
+                logger.warning("⚠️ Qwen: Missing Bearer token")
+                logger.error("❌ Qwen: Token not found in localStorage (checked: web_api_token, token, web_api_auth_token, access_token, auth_token)")
 
-                await browser.close()
+            # Success if we have bearer token
+            if not bearer_token:
+                raise Exception("Failed to extract Bearer token from localStorage")
 
-                # Success if we have bearer token
-                if not bearer_token:
-                    raise Exception("Failed to extract Bearer token from localStorage")
+            # Keep cookies + localStorage so the next login can skip the credential flow
+            await self.session_store.save_storage_state_async(await context.storage_state())
 
-                return {
-                    "cookies": cookie_dict,
-                    "token": bearer_token,
-                    "extra": {
-                        "method": "playwright",
-                        "web_api_token_length": len(web_api_token) if web_api_token else 0,
-                        "cookie_count": len(cookie_dict),
-                        "ssxmod_itna": ssxmod_itna
-                    }
+            return {
+                "cookies": cookie_dict,
+                "token": bearer_token,
+                "extra": {
+                    "method": "playwright",
+                    "web_api_token_length": len(web_api_token) if web_api_token else 0,
+                    "cookie_count": len(cookie_dict),
+                    "ssxmod_itna": ssxmod_itna
                 }
+            }
+
+        except Exception as e:
+            logger.error(f"❌ Qwen: Playwright login failed: {e}", exc_info=True)
+            raise
+        finally:
+            # Only the per-login context is closed; the pool decides when Chromium goes
+            await pool.release(context)
+
+    async def _submit_credentials(self, page) -> None:
+        """Open the login form, fill in credentials and wait for the login to land"""
+        # Click "Log in" button to go to login page
+        try:
+            logger.debug("🔍 Qwen: Looking for 'Log in' button")
+            login_link = await page.wait_for_selector(
+                'button:has-text("Log in"), button:has-text("登录"), a:has-text("Log in"), a:has-text("登录")',
+                timeout=5000
+            )
+            await login_link.click()
+            logger.info("👆 Qwen: Clicked 'Log in' button")
+        except Exception as e:
+            logger.debug(f"Qwen: Could not find/click login button: {e}, assuming already on login page")
 
-            except Exception as e:
-                logger.error(f"❌ Qwen: Playwright login failed: {e}", exc_info=True)
-                try:
-                    await browser.close()
-                except:
-                    pass
-                raise
+        # Wait for login form
+        logger.debug("🔐 Qwen: Waiting for login form")
+        await page.wait_for_selector('input[type="email"], input[type="text"], input[name="email"]', state='visible', timeout=10000)
+
+        # Fill in credentials and click login button
+        logger.debug("✏️ Qwen: Filling credentials")
+        submitted = await page.evaluate(self._JS_FILL_AND_SUBMIT, [self.email, self.password])
+        if not submitted:
+            # Unexpected form markup - fall back to Playwright's selector engine
+            logger.debug("Qwen: Batched fill failed, filling field by field")
+            email_input = await page.query_selector('input[type="email"], input[type="text"], input[name="email"]')
+            await email_input.fill(self.email)
+
+            password_input = await page.query_selector('input[type="password"], input[name="password"]')
+            await password_input.fill(self.password)
+
+            submit_button = await page.query_selector('button[type="submit"], button:has-text("登录"), button:has-text("Login")')
+            await submit_button.click()
+
+        # Wait for successful login
+        logger.debug("⏳ Qwen: Waiting for login to complete")
+        try:
+            await page.wait_for_url('**/chat**', timeout=20000)
+            logger.info("✅ Qwen: Login successful (URL changed)")
+        except:
+            try:
+                await page.wait_for_load_state('domcontentloaded', timeout=20000)
+                logger.info("✅ Qwen: Login successful (page loaded)")
+            except:
+                logger.warning("⚠️ Qwen: Timeout waiting for login, checking token anyway")
+
+    async def _wait_for_web_api_token(self, page) -> None:
+        """Wait until the web_api_token shows up in localStorage"""
+        logger.debug("🔑 Qwen: Waiting for localStorage token")
+        try:
+            # Resolves on the first truthy evaluation instead of fixed sleeps
+            await page.wait_for_function(
+                self._JS_GET_WEB_API_TOKEN, timeout=23000, polling=250
+            )
+            logger.info("✅ Qwen: Found web_api_token")
+        except Exception as e:
+            logger.debug(f"⏳ Qwen: Token wait timed out ({e}), checking token anyway")
+
+    async def _extract_cookies(self, context) -> list:
+        """Fetch unexpired cookies scoped to COOKIE_URLS"""
+        logger.debug("🍪 Qwen: Extracting cookies")
+        now = time.time()
+        return [
+            c for c in await context.cookies(self.COOKIE_URLS)
+            if c.get('expires', -1) == -1 or c['expires'] > now
+        ]
+
+
+# 认证实例注册表：认证字段相同的配置共享同一实例（内存会话缓存和单飞登录）
+# 只用标量认证字段做键，配置中的列表/字典等其他字段不参与
+_AUTH_KEY_FIELDS = ("name", "baseUrl", "loginUrl", "email", "password", "bearer_token")
+_auth_instances: Dict[tuple, ProviderAuth] = {}
 
 
 def create_provider_auth(provider_name: str, config: Dict[str, str]) -> ProviderAuth:
     """
     Factory function to create provider authentication instances
     
+    Configurations with identical auth fields share one instance, so its
+    in-memory session cache and single-flight login serve every caller.
+    
     Args:
         provider_name: Name of the provider ('qwen', etc.)
         config: Provider configuration
@@ -342,12 +454,20 @@ def create_provider_auth(provider_name: str, config: Dict[str, str]) -> Provider
         ProviderAuth instance for the specified provider
     """
     provider_name = provider_name.lower()
-    
-    if provider_name == 'qwen':
-        return QwenAuth(config)
-    else:
+    if provider_name != 'qwen':
         raise ValueError(f"Unknown provider: {provider_name}")
 
+    key = (provider_name,) + tuple(config.get(field) for field in _AUTH_KEY_FIELDS)
+    auth = _auth_instances.get(key)
+    if auth is None:
+        auth = _auth_instances[key] = QwenAuth(config)
+    return auth
+
+
+def clear_provider_auth_cache():
+    """Drop shared auth instances (e.g. after credentials change)"""
+    _auth_instances.clear()
+
 
 # Alias for backward compatibility
 create_auth = create_provider_auth
@@ -5,11 +5,12 @@
 负责根据模型名称自动选择合适的提供商
 """
 
-import json
 import time
 from pathlib import Path
 from typing import Any, AsyncGenerator, Dict, List, Optional, Union
 
+import orjson
+
 from app.core.config import settings
 from app.models.schemas import OpenAIRequest
 from app.providers.base import BaseProvider, ProviderConfig, provider_registry
@@ -71,12 +72,11 @@ class ProviderFactory:
         config_path = Path("config/providers.json")
         if config_path.exists():
             try:
-                with open(config_path, encoding='utf-8') as f:
-                    data = json.load(f)
-                    for provider in data.get("providers", []):
-                        if provider.get("enabled", True):
-                            configs[provider["name"]] = provider
-                    return configs
+                data = orjson.loads(config_path.read_bytes())
+                for provider in data.get("providers", []):
+                    if provider.get("enabled", True):
+                        configs[provider["name"]] = provider
+                return configs
             except Exception as e:
                 logger.warning(f"Failed to load provider configs: {e}")
         
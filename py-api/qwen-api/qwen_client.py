@@ -4,8 +4,10 @@ Qwen API Client
 Handles actual API calls to Qwen backend
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+from typing import AsyncIterator, Dict, Any, Optional
 import httpx
+import orjson
 from .config_loader import settings
 from .logging_config import logger
 
@@ -13,12 +15,13 @@ from .logging_config import logger
 class QwenClient:
     """Client for Qwen API interactions"""
     
-    def __init__(self, bearer_token: Optional[str] = None):
+    def __init__(self, bearer_token: Optional[str] = None, max_concurrency: int = 50):
         """
         Initialize Qwen client
         
         Args:
             bearer_token: Optional override for bearer token
+            max_concurrency: Maximum in-flight upstream requests (matches the keep-alive pool)
         """
         self.bearer_token = bearer_token or settings.qwen_bearer_token
         self.api_base = settings.qwen_api_base
@@ -26,6 +29,19 @@ class QwenClient:
         if not self.bearer_token:
             raise ValueError("QWEN_BEARER_TOKEN not configured")
         
+        # Request headers never change for a client, so build them once
+        self._auth_headers = {
+            "Authorization": f"Bearer {self.bearer_token}",
+            "Content-Type": "application/json"
+        }
+        
+        # Persistent HTTP/2 client, so completions reuse a warm TLS connection
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # Bursts queue here instead of overflowing the connection pool
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        
         logger.debug(f"Initialized QwenClient with base URL: {self.api_base}")
     
     async def chat_completion(
@@ -61,7 +77,142 @@ class QwenClient:
             httpx.HTTPStatusError: On API errors
             httpx.TimeoutException: On timeout
         """
-        # Build request payload
+        payload = self._build_payload(
+            model, messages, temperature, max_tokens, stream,
+            enable_thinking, thinking_budget, tools, tool_choice
+        )
+        
+        logger.debug("Calling Qwen API: %d messages, model=%s", len(messages), model)
+        
+        # Make API call
+        url = f"{self.api_base}/chat/completions"
+        
+        # orjson encodes the full message history far faster than httpx's stdlib json=
+        async with self._semaphore:
+            response = await self.http_client.post(url, headers=self._headers(), content=orjson.dumps(payload))
+        response.raise_for_status()
+        
+        result = orjson.loads(response.content)
+        logger.debug("Qwen API response received: status=%s", response.status_code)
+        
+        return result
+    
+    async def open_chat_stream(self, model: str, messages: list, **kwargs) -> httpx.Response:
+        """
+        Start a stream=True chat completion and return once the upstream status is known
+        
+        Errors surface here, before any response has been sent to our client,
+        instead of from inside an already-started stream.
+        
+        Args:
+            model: Model name
+            messages: Array of message objects
+            **kwargs: Same optional parameters as chat_completion()
+            
+        Returns:
+            Open upstream response; relay it with iter_chat_stream(), which
+            closes it (or call close_chat_stream() if it is never iterated)
+            
+        Raises:
+            httpx.HTTPStatusError: On API errors (the upstream response is already closed)
+        """
+        payload = self._build_payload(model, messages, stream=True, **kwargs)
+        
+        logger.debug("Streaming Qwen API: %d messages, model=%s", len(messages), model)
+        
+        url = f"{self.api_base}/chat/completions"
+        request = self.http_client.build_request(
+            "POST", url, headers=self._headers(), content=orjson.dumps(payload)
+        )
+        
+        # The concurrency slot is held until close_chat_stream()
+        await self._semaphore.acquire()
+        try:
+            response = await self.http_client.send(request, stream=True)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        
+        if response.is_error:
+            try:
+                await response.aread()
+            finally:
+                await self.close_chat_stream(response)
+            response.raise_for_status()
+        return response
+    
+    async def close_chat_stream(self, response: httpx.Response):
+        """Close a response from open_chat_stream() and free its concurrency slot"""
+        try:
+            await response.aclose()
+        finally:
+            self._semaphore.release()
+    
+    async def iter_chat_stream(self, response: httpx.Response) -> AsyncIterator[bytes]:
+        """
+        Relay the raw SSE bytes of a response from open_chat_stream()
+        
+        The response is closed and its concurrency slot freed when iteration
+        ends for any reason, including a client disconnect or a read error.
+        
+        Args:
+            response: Open upstream response from open_chat_stream()
+            
+        Yields:
+            Raw SSE bytes from the upstream response
+        """
+        try:
+            async for chunk in response.aiter_bytes():
+                yield chunk
+        finally:
+            await self.close_chat_stream(response)
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Persistent HTTP client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(60.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=self.max_concurrency,
+                    max_connections=100,
+                    keepalive_expiry=30.0
+                )
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the persistent HTTP client (call on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.aclose()
+    
+    def _headers(self) -> Dict[str, str]:
+        """Request headers for the Qwen API (shared, do not mutate)"""
+        return self._auth_headers
+    
+    @staticmethod
+    def _build_payload(
+        model: str,
+        messages: list,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        enable_thinking: bool = False,
+        thinking_budget: Optional[int] = None,
+        tools: Optional[list] = None,
+        tool_choice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the chat completions request payload, omitting unset options"""
         payload = {
             "model": model,
             "messages": messages,
@@ -82,22 +233,5 @@ class QwenClient:
         if tool_choice is not None:
             payload["tool_choice"] = tool_choice
         
-        logger.debug(f"Calling Qwen API: {len(messages)} messages, model={model}")
-        
-        # Make API call
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            headers = {
-                "Authorization": f"Bearer {self.bearer_token}",
-                "Content-Type": "application/json"
-            }
-            
-            url = f"{self.api_base}/chat/completions"
-            
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.debug(f"Qwen API response received: status={response.status_code}")
-            
-            return result
+        return payload
 
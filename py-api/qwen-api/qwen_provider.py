@@ -28,17 +28,61 @@ import mimetypes
 import time
 import uuid
 from dataclasses import dataclass
-from typing import Any, AsyncGenerator, Dict, List, Optional, Union
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, Dict, List, Mapping, Optional, Union
 
 import httpx
+import orjson
 
-from app.auth.provider_auth import QwenAuth
+from app.auth.provider_auth import create_provider_auth
 from app.models.schemas import OpenAIRequest
 from app.providers.base import BaseProvider, ProviderConfig
 from app.utils.logger import get_logger
 
 logger = get_logger()
 
+# 模型名称的功能后缀（clean_model_name按此顺序剥离）
+MODEL_SUFFIXES = ('-search', '-thinking', '-image', '-image_edit', '-video')
+
+# 模型映射（向后兼容），模块级只读映射，所有QwenProvider实例共享
+QWEN_MODEL_MAPPING: Mapping[str, str] = MappingProxyType({
+    "qwen-max": "qwen-max",
+    "qwen-max-latest": "qwen-max",
+    "qwen-max-thinking": "qwen-max",
+    "qwen-max-search": "qwen-max",
+    "qwen-max-image": "qwen-max",
+    "qwen-plus": "qwen-plus",
+    "qwen-plus-latest": "qwen-plus",
+    "qwen-turbo": "qwen-turbo",
+    "qwen-turbo-latest": "qwen-turbo",
+    "qwen-long": "qwen-long",
+    # Deep research aliases
+    "qwen-deep-research": "qwen-max",
+    "qwen-max-deep-research": "qwen-max",
+    # Code generation models (qwen3-coder series)
+    "qwen3-coder-plus": "qwen-plus",
+    "qwen-coder-plus": "qwen-plus",
+})
+
+# 支持的模型变体（基础模型 × 功能后缀 + 别名），模块加载时生成一次
+SUPPORTED_MODEL_VARIANTS = tuple(
+    f"{base}{suffix}"
+    for base in ("qwen-max", "qwen-plus", "qwen-turbo", "qwen-long")
+    for suffix in ("", "-thinking", "-search", "-image", "-image_edit", "-video", "-deep-research")
+) + (
+    "qwen-max-latest",
+    "qwen-max-0428",
+    "qwen-plus-latest",
+    "qwen-turbo-latest",
+    # Deep research aliases (without base prefix)
+    "qwen-deep-research",
+    # Code models
+    "qwen3-coder-plus",
+    "qwen-coder-plus",
+)
+
+
 @dataclass
 class QwenMessage:
     """Qwen-formatted message"""
@@ -480,6 +524,7 @@ class QwenRequestBuilder:
             return 'normal'
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def clean_model_name(model: str) -> str:
         """
         Remove known suffixes from model name.
@@ -490,9 +535,10 @@ class QwenRequestBuilder:
         Returns:
             Base model name (e.g., "qwen-max")
         """
-        # Remove known suffixes
-        suffixes = ['-search', '-thinking', '-image', '-image_edit', '-video']
-        for suffix in suffixes:
+        # Plain base names (the common case) skip the per-suffix scan
+        if not model.endswith(MODEL_SUFFIXES):
+            return model
+        for suffix in MODEL_SUFFIXES:
             if model.endswith(suffix):
                 return model[:-len(suffix)]
         return model
@@ -836,32 +882,15 @@ class QwenProvider(BaseProvider):
 
         # Authentication
         if auth_config:
-            self.auth = QwenAuth(auth_config)
+            self.auth = create_provider_auth("qwen", auth_config)
         else:
             self.auth = None
 
         # Request builder
         self.builder = QwenRequestBuilder()
 
-        # Model mapping for backward compatibility
-        self.model_mapping = {
-            "qwen-max": "qwen-max",
-            "qwen-max-latest": "qwen-max",
-            "qwen-max-thinking": "qwen-max",
-            "qwen-max-search": "qwen-max",
-            "qwen-max-image": "qwen-max",
-            "qwen-plus": "qwen-plus",
-            "qwen-plus-latest": "qwen-plus",
-            "qwen-turbo": "qwen-turbo",
-            "qwen-turbo-latest": "qwen-turbo",
-            "qwen-long": "qwen-long",
-            # Deep research aliases
-            "qwen-deep-research": "qwen-max",
-            "qwen-max-deep-research": "qwen-max",
-            # Code generation models (qwen3-coder series)
-            "qwen3-coder-plus": "qwen-plus",
-            "qwen-coder-plus": "qwen-plus",
-        }
+        # Model mapping for backward compatibility (shared, read-only)
+        self.model_mapping = QWEN_MODEL_MAPPING
 
     def get_supported_models(self) -> List[str]:
         """Get supported models list"""
@@ -935,7 +964,8 @@ class QwenProvider(BaseProvider):
             payload = self.builder.build_chat_session_payload(model, chat_type)
 
             logger.info(f"Creating Qwen chat session: model={model}, chat_type={chat_type}")
-            logger.debug(f"Session payload: {json.dumps(payload, indent=2)}")
+            # lazy: the pretty-printed dump is only built when DEBUG is enabled
+            logger.opt(lazy=True).debug("Session payload: {}", lambda: json.dumps(payload, indent=2))
 
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.post(
@@ -992,7 +1022,7 @@ class QwenProvider(BaseProvider):
         async with httpx.AsyncClient(timeout=self.config.timeout) as client:
             http_response = await client.post(
                 transformed["url"],
-                json=transformed["body"],
+                content=orjson.dumps(transformed["body"]),
                 headers=transformed["headers"]
             )
 
@@ -1139,7 +1169,7 @@ class QwenProvider(BaseProvider):
                 body["top_p"] = request.top_p
 
         # Log the complete request body for debugging
-        logger.debug(f"📦 Complete Qwen request body:\n{json.dumps(body, indent=2)}")
+        logger.opt(lazy=True).debug("📦 Complete Qwen request body:\n{}", lambda: json.dumps(body, indent=2))
 
         # Verify all critical fields are present
         if chat_type == "normal":
@@ -1190,8 +1220,10 @@ class QwenProvider(BaseProvider):
 
         if isinstance(response, httpx.Response):
             try:
-                data = response.json()
-                logger.debug(f"🔍 Raw Qwen API response: {json.dumps(data, ensure_ascii=False, indent=2)}")
+                data = orjson.loads(response.content)
+                logger.opt(lazy=True).debug(
+                    "🔍 Raw Qwen API response: {}", lambda: json.dumps(data, ensure_ascii=False, indent=2)
+                )
 
                 # Extract content from various possible locations
                 content = ""
@@ -1255,35 +1287,41 @@ class QwenProvider(BaseProvider):
             OpenAI formatted SSE chunks
         """
         chat_id = self.create_chat_id()
-        buffer = ""
+        buffer = bytearray()
 
         try:
-            async for chunk in response.aiter_text():
-                buffer += chunk
+            # Frame lines on raw bytes: no per-chunk text decode, and no
+            # re-copying the remaining buffer for every line split off
+            async for chunk in response.aiter_bytes():
+                buffer.extend(chunk)
+                start = 0
 
                 # Process complete lines
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
+                while True:
+                    end = buffer.find(b"\n", start)
+                    if end == -1:
+                        break
+                    line = buffer[start:end].strip()
+                    start = end + 1
 
                     if not line:
                         continue
 
                     # Skip non-data lines
-                    if not line.startswith("data:"):
+                    if not line.startswith(b"data:"):
                         continue
 
                     # Extract data
                     data_str = line[5:].strip()
 
                     # Check for [DONE]
-                    if data_str == "[DONE]":
+                    if data_str == b"[DONE]":
                         # Send final done chunk
                         yield "data: [DONE]\n\n"
                         break
 
                     try:
-                        data = json.loads(data_str)
+                        data = orjson.loads(data_str)
 
                         # Check for errors
                         if data.get("success") is False:
@@ -1329,12 +1367,14 @@ class QwenProvider(BaseProvider):
 
                     except json.JSONDecodeError:
                         # Skip malformed JSON
-                        logger.warning(f"Skipping malformed JSON: {data_str[:100]}")
+                        logger.warning(f"Skipping malformed JSON: {data_str[:100].decode('utf-8', 'replace')}")
                         continue
                     except Exception as e:
                         logger.error(f"Error processing chunk: {e}")
                         continue
 
+                del buffer[:start]
+
         except Exception as e:
             logger.error(f"Error in stream_response: {e}", exc_info=True)
             # Send error chunk
@@ -1881,45 +1921,9 @@ class QwenProvider(BaseProvider):
         - -deep-research (comprehensive research)
 
         Returns:
-            List of all model variant names
+            List of all model variant names (fresh copy, safe to mutate)
         """
-        base_models = [
-            "qwen-max",
-            "qwen-plus",
-            "qwen-turbo",
-            "qwen-long"
-        ]
-
-        suffixes = [
-            "",  # Base model
-            "-thinking",
-            "-search",
-            "-image",
-            "-image_edit",
-            "-video",
-            "-deep-research"
-        ]
-
-        models = []
-        for base in base_models:
-            for suffix in suffixes:
-                models.append(f"{base}{suffix}")
-
-        # Add aliases
-        models.extend([
-            "qwen-max-latest",
-            "qwen-max-0428",
-            "qwen-plus-latest",
-            "qwen-turbo-latest",
-            # Deep research aliases (without base prefix)
-            "qwen-deep-research",
-            # Code models
-            "qwen3-coder-plus",
-            "qwen-coder-plus"
-        ])
-
-        logger.debug(f"Generated {len(models)} model variants")
-        return models
+        return list(SUPPORTED_MODEL_VARIANTS)
 
     async def deep_research(
         self,
@@ -23,11 +23,12 @@ API Endpoint: https://qwen.aikit.club/v1/
 import asyncio
 import json
 import time
-from typing import Any, AsyncGenerator, Dict, List, Optional, Union
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple, Union
 
 import httpx
+import orjson
 
-from app.auth.provider_auth import QwenAuth
+from app.auth.provider_auth import create_provider_auth
 from app.core.config import settings
 from app.models.schemas import OpenAIRequest
 from app.providers.base import BaseProvider, ProviderConfig
@@ -35,6 +36,34 @@ from app.utils.logger import get_logger
 
 logger = get_logger()
 
+# SSE framing, matched and emitted as bytes in the stream loop
+_SSE_DATA_PREFIX = b"data: "
+_SSE_TERM = b"\n\n"
+
+# One client for every QwenProxyProvider: HTTP/2 multiplexes concurrent
+# completions over a warm TLS connection instead of one pool per instance
+_proxy_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_proxy_client() -> httpx.AsyncClient:
+    """Return the shared proxy client, creating it on first use"""
+    global _proxy_client
+    if _proxy_client is None or _proxy_client.is_closed:
+        _proxy_client = httpx.AsyncClient(
+            http2=True,
+            timeout=QwenProxyProvider.TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200)
+        )
+    return _proxy_client
+
+
+async def close_proxy_client():
+    """Close the shared proxy client (call on application shutdown)"""
+    global _proxy_client
+    if _proxy_client is not None:
+        await _proxy_client.aclose()
+        _proxy_client = None
+
 
 class QwenProxyProvider(BaseProvider):
     """
@@ -50,13 +79,25 @@ class QwenProxyProvider(BaseProvider):
     # Request Configuration
     TIMEOUT = 60.0
     MAX_RETRIES = 3
+    MODELS_CACHE_TTL = 300.0  # The proxy's model list rarely changes
 
     def __init__(self, config: ProviderConfig):
         """Initialize Qwen Proxy Provider"""
         super().__init__(config)
         self.auth = None
         self.bearer_token = None
-        self.http_client = httpx.AsyncClient(timeout=self.TIMEOUT)
+        # Set once the proxy rejects QWEN_BEARER_TOKEN, so re-initialization uses Playwright
+        self._env_token_rejected = False
+        # Auth headers built once per token, not per request
+        self._auth_headers: Optional[Dict[str, str]] = None
+        self._auth_headers_token: Optional[str] = None
+        # (fetched_at, model IDs) from the last successful list_models()
+        self._models_cache: Optional[Tuple[float, List[str]]] = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Process-wide HTTP/2 client shared by all proxy provider instances"""
+        return _get_proxy_client()
 
     async def initialize(self) -> bool:
         """
@@ -68,12 +109,21 @@ class QwenProxyProvider(BaseProvider):
         """
         try:
             # Priority 1: Check environment variable
-            if settings.QWEN_BEARER_TOKEN:
+            if settings.QWEN_BEARER_TOKEN and not self._env_token_rejected:
                 logger.info("🔑 Using QWEN_BEARER_TOKEN from environment")
                 self.bearer_token = settings.QWEN_BEARER_TOKEN
                 
-                # Validate token
-                is_valid = await self._validate_token(self.bearer_token)
+                # Lazy validation: the first real request doubles as the check
+                if settings.QWEN_SKIP_TOKEN_VALIDATION:
+                    logger.info("⏭️ Skipping token validation, first API call will validate it")
+                    return True
+                
+                # Validate token and warm the model list cache in one round-trip
+                # time; list_models() only caches a successful response
+                is_valid, _ = await asyncio.gather(
+                    self._validate_token(self.bearer_token),
+                    self.list_models()
+                )
                 if is_valid:
                     logger.info("✅ Bearer token validated successfully")
                     return True
@@ -88,7 +138,7 @@ class QwenProxyProvider(BaseProvider):
                 return False
 
             # Initialize Qwen authentication
-            self.auth = QwenAuth(config={
+            self.auth = create_provider_auth("qwen", {
                 "name": "qwen",
                 "baseUrl": "https://chat.qwen.ai",
                 "loginUrl": "https://chat.qwen.ai",
@@ -145,20 +195,44 @@ class QwenProxyProvider(BaseProvider):
             logger.error(f"❌ Token validation error: {e}")
             return False
 
+    def _check_token_rejected(self, status_code: int):
+        """
+        Drop a bearer token the proxy answered 401 for
+        
+        The next request re-initializes; a rejected QWEN_BEARER_TOKEN is not
+        retried, so that falls through to Playwright authentication.
+        
+        Args:
+            status_code: HTTP status returned by the proxy
+        """
+        if status_code != 401 or not self.bearer_token:
+            return
+        if self.bearer_token == settings.QWEN_BEARER_TOKEN:
+            logger.warning("⚠️  Proxy rejected QWEN_BEARER_TOKEN, switching to Playwright on next request")
+            self._env_token_rejected = True
+        elif self.auth:
+            # Stale Playwright session - force a fresh login next time
+            self.auth.clear_session()
+        self.bearer_token = None
+
     async def get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers for proxy requests"""
         if not self.bearer_token:
             raise ValueError("Bearer token not initialized. Call initialize() first.")
         
-        return {
-            "Authorization": f"Bearer {self.bearer_token}",
-            "Content-Type": "application/json",
-        }
+        if self._auth_headers_token != self.bearer_token:
+            self._auth_headers = {
+                "Authorization": f"Bearer {self.bearer_token}",
+                "Content-Type": "application/json",
+            }
+            self._auth_headers_token = self.bearer_token
+        # Copy so callers can't corrupt the cached headers
+        return dict(self._auth_headers)
 
     async def chat_completion(
         self,
         request: OpenAIRequest
-    ) -> Union[Dict[str, Any], AsyncGenerator[str, None]]:
+    ) -> Union[Dict[str, Any], AsyncGenerator[bytes, None]]:
         """
         Send chat completion request to Qwen proxy
         
@@ -177,29 +251,11 @@ class QwenProxyProvider(BaseProvider):
                 if not initialized:
                     raise ValueError("Failed to initialize Qwen Proxy Provider")
 
-            # Build request body (standard OpenAI format)
-            request_body = {
-                "model": request.model,
-                "messages": [
-                    {
-                        "role": msg.role,
-                        "content": msg.content
-                    }
-                    for msg in request.messages
-                ],
-                "stream": request.stream if request.stream is not None else True,
-            }
-
-            # Optional parameters
-            if request.temperature is not None:
-                request_body["temperature"] = request.temperature
-            if request.max_tokens is not None:
-                request_body["max_tokens"] = request.max_tokens
-            if request.top_p is not None:
-                request_body["top_p"] = request.top_p
+            request_body = self._build_body(request)
 
             logger.info(f"📤 Sending request to {self.CHAT_COMPLETIONS_ENDPOINT}")
-            logger.debug(f"Request body: {json.dumps(request_body, indent=2)}")
+            # lazy: the pretty-printed dump is only built when DEBUG is enabled
+            logger.opt(lazy=True).debug("Request body: {}", lambda: json.dumps(request_body, indent=2))
 
             # Get auth headers
             headers = await self.get_auth_headers()
@@ -225,17 +281,18 @@ class QwenProxyProvider(BaseProvider):
         try:
             response = await self.http_client.post(
                 self.CHAT_COMPLETIONS_ENDPOINT,
-                json=request_body,
+                content=orjson.dumps(request_body),
                 headers=headers
             )
             
             if response.status_code != 200:
                 error_text = response.text
                 logger.error(f"❌ Proxy returned error {response.status_code}: {error_text}")
+                self._check_token_rejected(response.status_code)
                 raise ValueError(f"Proxy error: {response.status_code}")
             
             # Parse and return JSON response
-            result = response.json()
+            result = orjson.loads(response.content)
             logger.info("✅ Non-streaming completion successful")
             return result
             
@@ -247,13 +304,13 @@ class QwenProxyProvider(BaseProvider):
         self,
         request_body: Dict[str, Any],
         headers: Dict[str, str]
-    ) -> AsyncGenerator[str, None]:
-        """Handle streaming completion request"""
+    ) -> AsyncGenerator[bytes, None]:
+        """Handle streaming completion request (yields SSE event bytes)"""
         try:
             async with self.http_client.stream(
                 "POST",
                 self.CHAT_COMPLETIONS_ENDPOINT,
-                json=request_body,
+                content=orjson.dumps(request_body),
                 headers=headers
             ) as response:
                 
@@ -261,21 +318,37 @@ class QwenProxyProvider(BaseProvider):
                 if response.status_code != 200:
                     error_text = await response.aread()
                     logger.error(f"❌ Proxy returned error {response.status_code}: {error_text.decode()}")
+                    self._check_token_rejected(response.status_code)
                     raise ValueError(f"Proxy error: {response.status_code}")
 
-                # Stream response
-                async for line in response.aiter_lines():
-                    if line.strip():
-                        # Proxy returns SSE format: "data: {...}"
-                        if line.startswith("data: "):
-                            yield line + "\n\n"
+                # Stream response: split lines on raw bytes and relay only the
+                # "data: {...}" lines the proxy returns in SSE format, without
+                # a decode/encode round-trip (StreamingResponse sends bytes as-is)
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes():
+                    buffer.extend(chunk)
+                    start = 0
+                    while True:
+                        end = buffer.find(b"\n", start)
+                        if end == -1:
+                            break
+                        if buffer.startswith(_SSE_DATA_PREFIX, start):
+                            yield bytes(buffer[start:end].rstrip(b"\r")) + _SSE_TERM
+                        start = end + 1
+                    del buffer[:start]
+                # Last line may arrive without a trailing newline
+                if buffer.startswith(_SSE_DATA_PREFIX):
+                    yield bytes(buffer.rstrip(b"\r")) + _SSE_TERM
                             
         except Exception as e:
             logger.error(f"❌ Streaming completion error: {e}", exc_info=True)
             raise
 
     async def list_models(self) -> List[str]:
-        """List available models from the proxy"""
+        """List available models from the proxy (cached for MODELS_CACHE_TTL seconds)"""
+        if self._models_cache and time.monotonic() - self._models_cache[0] < self.MODELS_CACHE_TTL:
+            return list(self._models_cache[1])
+
         try:
             headers = await self.get_auth_headers()
             response = await self.http_client.get(
@@ -284,9 +357,11 @@ class QwenProxyProvider(BaseProvider):
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 # Extract model IDs from OpenAI-format response
-                return [model["id"] for model in data.get("data", [])]
+                models = [model["id"] for model in data.get("data", [])]
+                self._models_cache = (time.monotonic(), models)
+                return list(models)
             else:
                 logger.error(f"❌ Failed to list models: {response.status_code}")
                 return []
@@ -302,26 +377,27 @@ class QwenProxyProvider(BaseProvider):
         Since the proxy is OpenAI-compatible, we can pass through the request
         with minimal transformation.
         """
-        request_body = {
-            "model": request.model,
-            "messages": [
-                {
-                    "role": msg.role,
-                    "content": msg.content
-                }
-                for msg in request.messages
-            ],
-            "stream": request.stream if request.stream is not None else True,
-        }
-
-        # Optional parameters
-        if request.temperature is not None:
-            request_body["temperature"] = request.temperature
-        if request.max_tokens is not None:
-            request_body["max_tokens"] = request.max_tokens
-        if request.top_p is not None:
-            request_body["top_p"] = request.top_p
-
+        return self._build_body(request)
+
+    # Fields forwarded to the proxy; messages keep only role and content
+    _BODY_FIELDS = {
+        "model": True,
+        "messages": {"__all__": {"role", "content"}},
+        "stream": True,
+        "temperature": True,
+        "max_tokens": True,
+        "top_p": True,
+    }
+
+    @classmethod
+    def _build_body(cls, request: OpenAIRequest) -> Dict[str, Any]:
+        """Build the proxy request body (standard OpenAI format)"""
+        # pydantic-core dumps the whole tree (including content parts) in one pass
+        dumped = request.model_dump(include=cls._BODY_FIELDS)
+        # Drop unset optional parameters at the top level only; a message's
+        # content (None on assistant tool-call turns) is still sent as null
+        request_body = {key: value for key, value in dumped.items() if value is not None}
+        request_body.setdefault("stream", True)
         return request_body
 
     async def transform_response(self, response: Any, request: OpenAIRequest) -> AsyncGenerator[str, None]:
@@ -343,6 +419,9 @@ class QwenProxyProvider(BaseProvider):
                 yield str(response)
 
     async def cleanup(self):
-        """Cleanup resources"""
-        if self.http_client:
-            await self.http_client.aclose()
+        """
+        Cleanup resources
+        
+        The HTTP client is shared with other provider instances, so it is left
+        open here; close_proxy_client() closes it on application shutdown.
+        """
@@ -7,10 +7,14 @@ Logs into chat.qwen.ai and extracts the JWT token from localStorage
 import asyncio
 import json
 import os
+import time
+from pathlib import Path
 from typing import Optional
 
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import Page
 
+from app.auth.browser_pool import CHROMIUM_ARGS, block_heavy_resources, get_browser_pool, get_playwright
+from app.auth.session_store import SessionStore, _token_expiry
 from app.utils.logger import get_logger
 
 logger = get_logger()
@@ -19,72 +23,141 @@ logger = get_logger()
 class QwenTokenExtractor:
     """Extracts JWT token from Qwen's chat interface using Playwright"""
     
-    def __init__(self, email: str, password: str):
+    # Reuse a stored token younger than this instead of launching a browser
+    SESSION_MAX_AGE = 43200  # 12 hours
+    
+    # page.evaluate / wait_for_function scripts, built once per process
+    _JS_GET_TOKEN = "() => localStorage.getItem('token')"
+    _JS_HAS_TOKEN = "() => !!localStorage.getItem('token')"
+    
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        persistent: bool = False,
+        session_dir: str = ".sessions"
+    ):
+        """
+        Args:
+            email: Qwen account email
+            password: Qwen account password
+            persistent: Keep cookies/localStorage in an on-disk Chromium profile
+            session_dir: Directory for the session file and browser profile
+        """
         self.email = email
         self.password = password
+        self.persistent = persistent
+        self.session_dir = Path(session_dir)
+        # Own session file: QwenAuth's "qwen" session holds the compressed token and cookies
+        self.session_store = SessionStore("qwen_extractor", storage_dir=session_dir)
         self.token: Optional[str] = None
         
-    async def extract_token(self) -> Optional[str]:
+    async def extract_token(self, force_new: bool = False) -> Optional[str]:
         """
         Main method to extract token from chat.qwen.ai
         
+        Args:
+            force_new: Ignore the stored session and always run the browser flow
+        
         Returns:
             str: JWT token if successful, None otherwise
         """
+        # A fresh stored session only needs the token - skip the browser entirely
+        if not force_new:
+            session = await self.session_store.load_valid_session_async(max_age=self.SESSION_MAX_AGE)
+            token = session.get("token") if session else None
+            if self._looks_like_jwt(token):
+                logger.info("✅ Using stored Qwen session token")
+                self.token = token
+                return token
+        
         try:
-            async with async_playwright() as p:
-                # Launch browser in headless mode
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                
-                logger.info("🌐 Navigating to chat.qwen.ai...")
-                await page.goto("https://chat.qwen.ai", wait_until="networkidle")
-                
-                # Check if already logged in
-                token = await self._check_existing_token(page)
-                if token:
-                    logger.info("✅ Found existing token")
-                    await browser.close()
-                    return token
-                
-                # Perform login
-                logger.info("🔐 Logging in...")
-                success = await self._perform_login(page)
-                
-                if not success:
-                    logger.error("❌ Login failed")
-                    await browser.close()
-                    return None
-                
-                # Extract token from localStorage
-                logger.info("🔑 Extracting token...")
-                token = await self._extract_token_from_storage(page)
-                
-                await browser.close()
+            if self.persistent:
+                token = await self._extract_with_profile()
+            else:
+                token = await self._extract_with_pool()
+            
+            if token:
+                logger.info("✅ Token extracted successfully")
+                self.token = token
+                await self.session_store.save_session_async({}, token, {"method": "extractor"})
+                return token
+            else:
+                logger.error("❌ Failed to extract token")
+                return None
                 
-                if token:
-                    logger.info("✅ Token extracted successfully")
-                    self.token = token
-                    return token
-                else:
-                    logger.error("❌ Failed to extract token")
-                    return None
-                    
         except Exception as e:
             logger.error(f"❌ Error during token extraction: {e}")
             return None
     
+    @staticmethod
+    def _looks_like_jwt(token: Optional[str]) -> bool:
+        """Check the value has the header.payload.signature shape of a JWT"""
+        return bool(token) and token.count(".") == 2 and all(token.split("."))
+    
+    async def _extract_with_pool(self) -> Optional[str]:
+        """Run the login flow in a context borrowed from the shared browser pool"""
+        pool = get_browser_pool()
+        context = await pool.acquire()
+        try:
+            page = await context.new_page()
+            return await self._run_flow(page)
+        finally:
+            await pool.release(context)
+    
+    async def _extract_with_profile(self) -> Optional[str]:
+        """Run the login flow on the persistent on-disk Chromium profile"""
+        playwright = await get_playwright()
+        # Persistent profile keeps cookies/localStorage across runs
+        context = await playwright.chromium.launch_persistent_context(
+            str(self.session_dir / "profile"),
+            headless=True,
+            args=CHROMIUM_ARGS
+        )
+        try:
+            await context.route("**/*", block_heavy_resources)
+            page = context.pages[0] if context.pages else await context.new_page()
+            return await self._run_flow(page)
+        finally:
+            await context.close()
+    
+    async def _run_flow(self, page: Page) -> Optional[str]:
+        """Navigate, log in if needed and read the token from localStorage"""
+        logger.info("🌐 Navigating to chat.qwen.ai...")
+        await page.goto("https://chat.qwen.ai", wait_until="domcontentloaded")
+        
+        # Check if already logged in
+        token = await self._check_existing_token(page)
+        if token:
+            logger.info("✅ Found existing token")
+            return token
+        
+        # Perform login
+        logger.info("🔐 Logging in...")
+        success = await self._perform_login(page)
+        
+        if not success:
+            logger.error("❌ Login failed")
+            return None
+        
+        # Extract token from localStorage
+        logger.info("🔑 Extracting token...")
+        return await self._extract_token_from_storage(page)
+    
     async def _check_existing_token(self, page: Page) -> Optional[str]:
-        """Check if token already exists in localStorage"""
+        """Check if an unexpired token already exists in localStorage"""
         try:
-            token = await page.evaluate("""
-                () => {
-                    return localStorage.getItem('token');
-                }
-            """)
-            return token if token else None
+            token = await page.evaluate(self._JS_GET_TOKEN)
         except Exception:
             return None
+        if not token:
+            return None
+        # A profile can outlive its token; reusing it would only hand back an expired JWT
+        expires_at = _token_expiry(token)
+        if expires_at is not None and expires_at <= time.time():
+            logger.info("⏰ Stored profile token expired, logging in again")
+            return None
+        return token
     
     async def _perform_login(self, page: Page) -> bool:
         """
@@ -97,19 +170,20 @@ class QwenTokenExtractor:
             # Wait for login button/form
             await page.wait_for_selector('input[type="email"], input[type="text"]', timeout=10000)
             
-            # Fill in email
+            # Fill in email (fills are awaited, no settle delay needed)
             await page.fill('input[type="email"], input[type="text"]', self.email)
-            await asyncio.sleep(0.5)
             
             # Fill in password
             await page.fill('input[type="password"]', self.password)
-            await asyncio.sleep(0.5)
             
             # Click login button
             await page.click('button[type="submit"]')
             
-            # Wait for navigation/token to be set
-            await asyncio.sleep(3)
+            # Wait for the token to be set instead of sleeping a fixed time
+            try:
+                await page.wait_for_function(self._JS_HAS_TOKEN, timeout=15000)
+            except Exception:
+                logger.warning("⚠️ Timeout waiting for token, checking storage anyway")
             
             return True
             
@@ -125,15 +199,7 @@ class QwenTokenExtractor:
             str: JWT token if found, None otherwise
         """
         try:
-            token = await page.evaluate("""
-                () => {
-                    const token = localStorage.getItem('token');
-                    if (!token) {
-                        return null;
-                    }
-                    return token;
-                }
-            """)
+            token = await page.evaluate(self._JS_GET_TOKEN)
             
             return token if token else None
             
@@ -142,13 +208,15 @@ class QwenTokenExtractor:
             return None
 
 
-async def get_qwen_token(email: str = None, password: str = None) -> Optional[str]:
+async def get_qwen_token(email: str = None, password: str = None, persistent: bool = False) -> Optional[str]:
     """
     Convenience function to get Qwen token
     
     Args:
         email: Qwen account email (defaults to env var QWEN_EMAIL)
         password: Qwen account password (defaults to env var QWEN_PASSWORD)
+        persistent: Keep login cookies in an unencrypted on-disk Chromium profile
+            instead of borrowing a throwaway context from the shared browser pool
         
     Returns:
         str: JWT token if successful, None otherwise
@@ -160,7 +228,7 @@ async def get_qwen_token(email: str = None, password: str = None) -> Optional[st
         logger.error("❌ QWEN_EMAIL and QWEN_PASSWORD must be set")
         return None
     
-    extractor = QwenTokenExtractor(email, password)
+    extractor = QwenTokenExtractor(email, password, persistent=persistent)
     return await extractor.extract_token()
 
 
@@ -7,10 +7,138 @@ import asyncio
 import json
 import os
 import sys
-from typing import Optional
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from playwright.async_api import async_playwright
 
+# Kept in step with app.auth.browser_pool by hand: get_qwen_token.py runs this file
+# as a standalone script, where the app package (and its logger) is not importable.
+# Chromium flags that drop GPU, extensions and background services a login never uses
+CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--no-first-run",
+    "--disable-features=TranslateUI",
+]
+
+# Third-party hosts irrelevant to token extraction, aborted before navigation
+# (same set as browser_pool.BLOCKED_URL_PATTERN)
+BLOCK_HOSTS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "doubleclick.net",
+    "hotjar.com",
+    "sentry.io",
+    "cloudflareinsights.com",
+)
+
+# Selectors that worked on the previous run are tried first on the next one
+SELECTOR_CACHE_FILE = Path(".sessions") / "qwen_selectors.json"
+
+EMAIL_SELECTORS = [
+    'input[type="email"]',
+    'input[type="text"]',
+    'input[placeholder*="email" i]',
+    'input[placeholder*="Email" i]',
+    'input[name="email"]',
+    'input[name="username"]',
+]
+
+SUBMIT_SELECTORS = [
+    'button[type="submit"]',
+    'button:has-text("Log in")',
+    'button:has-text("Sign in")',
+    'button:has-text("Submit")',
+    'button:has-text("Continue")',
+]
+
+
+# page.evaluate / wait_for_function scripts, built once per process
+JS_FIND_LOCAL_TOKEN = """
+() => {
+    // Try common token storage keys
+    const keys = ['token', 'authToken', 'auth_token', 'accessToken', 'access_token', 'jwt', 'JWT'];
+    for (const key of keys) {
+        const val = localStorage.getItem(key);
+        if (val && val.length > 50) {
+            return val;
+        }
+    }
+
+    // Try to find in all localStorage (anything that looks like a JWT)
+    return Object.values(localStorage)
+        .find(val => val.length > 100 && val.includes('.')) || null;
+}
+"""
+
+JS_FIND_SESSION_TOKEN = """
+() => Object.values(sessionStorage)
+    .find(val => val.length > 100 && val.includes('.')) || null
+"""
+
+JS_HAS_JWT = "() => Object.values(localStorage).some(val => val.length > 100 && val.includes('.'))"
+
+
+def _load_selector_cache() -> Dict[str, str]:
+    """Load the field -> selector map saved by the last successful run"""
+    try:
+        return json.loads(SELECTOR_CACHE_FILE.read_text())
+    except Exception:
+        return {}
+
+
+def _save_selector_cache(cache: Dict[str, str]):
+    """Persist the field -> selector map for the next run"""
+    try:
+        SELECTOR_CACHE_FILE.parent.mkdir(exist_ok=True)
+        SELECTOR_CACHE_FILE.write_text(json.dumps(cache))
+    except Exception as e:
+        print(f"  ⚠️ Could not save selector cache: {e}", file=sys.stderr)
+
+
+def _ordered_selectors(cache: Dict[str, str], field: str, defaults: List[str]) -> List[str]:
+    """Return defaults with the cached winner for field moved to the front"""
+    cached = cache.get(field)
+    if cached:
+        return [cached] + [s for s in defaults if s != cached]
+    return defaults
+
+
+async def _block_third_party(route):
+    """Abort analytics/telemetry requests, let everything else through"""
+    if any(host in route.request.url for host in BLOCK_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _first_visible(page, selectors: List[str], timeout: int = 5000) -> Optional[str]:
+    """
+    Race visibility waits for all selectors and return the first one that shows up
+
+    When several become visible together, the earliest in selectors wins.
+    """
+    tasks = {
+        asyncio.create_task(page.locator(selector).first.wait_for(state="visible", timeout=timeout)): selector
+        for selector in selectors
+    }
+    pending = set(tasks)
+    winner = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            visible = [tasks[task] for task in done if task.exception() is None]
+            if visible:
+                winner = min(visible, key=selectors.index)
+    finally:
+        for task in pending:
+            task.cancel()
+    return winner
+
 
 async def extract_qwen_token(email: str, password: str) -> Optional[str]:
     """
@@ -24,38 +152,33 @@ async def extract_qwen_token(email: str, password: str) -> Optional[str]:
         JWT token or None
     """
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+        browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
         context = await browser.new_context()
+        await context.route("**/*", _block_third_party)
         page = await context.new_page()
         
         try:
             print("🌐 Navigating to chat.qwen.ai...", file=sys.stderr)
-            await page.goto("https://chat.qwen.ai", timeout=30000)
+            await page.goto("https://chat.qwen.ai", wait_until="domcontentloaded", timeout=30000)
             
             # Click "Log in" button
             print("🔑 Clicking login button...", file=sys.stderr)
             await page.click('button:has-text("Log in")', timeout=10000)
             
-            # Wait for login modal/page
-            await asyncio.sleep(2)
+            # Wait for login modal/page to render the form
+            await page.wait_for_selector('input[type="password"]', state="visible", timeout=10000)
             
             # Look for email/username input
             print("📧 Entering email...", file=sys.stderr)
-            email_selectors = [
-                'input[type="email"]',
-                'input[type="text"]',
-                'input[placeholder*="email" i]',
-                'input[placeholder*="Email" i]',
-                'input[name="email"]',
-                'input[name="username"]',
-            ]
+            selector_cache = _load_selector_cache()
             
             email_input = None
-            for selector in email_selectors:
+            for selector in _ordered_selectors(selector_cache, "email", EMAIL_SELECTORS):
                 try:
                     email_input = await page.query_selector(selector)
                     if email_input:
                         await page.fill(selector, email)
+                        selector_cache["email"] = selector
                         print(f"  ✅ Found email input: {selector}", file=sys.stderr)
                         break
                 except Exception:
@@ -67,63 +190,37 @@ async def extract_qwen_token(email: str, password: str) -> Optional[str]:
                 print("  📸 Screenshot saved to /tmp/qwen_login_error.png", file=sys.stderr)
                 return None
             
-            await asyncio.sleep(0.5)
-            
             # Fill password
             print("🔒 Entering password...", file=sys.stderr)
             await page.fill('input[type="password"]', password)
-            await asyncio.sleep(0.5)
             
             # Click submit button
             print("🚀 Clicking submit...", file=sys.stderr)
-            submit_selectors = [
-                'button[type="submit"]',
-                'button:has-text("Log in")',
-                'button:has-text("Sign in")',
-                'button:has-text("Submit")',
-                'button:has-text("Continue")',
-            ]
-            
-            for selector in submit_selectors:
-                try:
-                    await page.click(selector, timeout=2000)
-                    print(f"  ✅ Clicked: {selector}", file=sys.stderr)
-                    break
-                except Exception:
-                    continue
+            selector = await _first_visible(
+                page, _ordered_selectors(selector_cache, "submit", SUBMIT_SELECTORS)
+            )
+            if selector:
+                await page.click(selector)
+                selector_cache["submit"] = selector
+                print(f"  ✅ Clicked: {selector}", file=sys.stderr)
+            else:
+                print("  ⚠️ Could not find submit button", file=sys.stderr)
+            
+            _save_selector_cache(selector_cache)
             
-            # Wait for login to complete
+            # Wait for login to complete (leave the sign-in page, then a JWT lands in storage)
             print("⏳ Waiting for login...", file=sys.stderr)
-            await asyncio.sleep(5)
+            try:
+                await page.wait_for_url(lambda url: "auth" not in url, timeout=15000)
+                await page.wait_for_function(JS_HAS_JWT, timeout=15000)
+            except Exception:
+                print("  ⚠️ Timeout waiting for login, checking storage anyway", file=sys.stderr)
             
             # Try to extract token from various storage mechanisms
             print("🔍 Extracting token...", file=sys.stderr)
             
             # Method 1: localStorage
-            token = await page.evaluate("""
-                () => {
-                    // Try common token storage keys
-                    const keys = ['token', 'authToken', 'auth_token', 'accessToken', 'access_token', 'jwt', 'JWT'];
-                    for (const key of keys) {
-                        const val = localStorage.getItem(key);
-                        if (val && val.length > 50) {
-                            return val;
-                        }
-                    }
-                    
-                    // Try to find in all localStorage
-                    for (let i = 0; i < localStorage.length; i++) {
-                        const key = localStorage.key(i);
-                        const val = localStorage.getItem(key);
-                        if (val && val.length > 100 && val.includes('.')) {
-                            // Looks like a JWT
-                            return val;
-                        }
-                    }
-                    
-                    return null;
-                }
-            """)
+            token = await page.evaluate(JS_FIND_LOCAL_TOKEN)
             
             if token:
                 print(f"✅ Token extracted from localStorage ({len(token)} chars)", file=sys.stderr)
@@ -131,7 +228,7 @@ async def extract_qwen_token(email: str, password: str) -> Optional[str]:
                 return token
             
             # Method 2: Check cookies
-            cookies = await context.cookies()
+            cookies = await context.cookies(["https://chat.qwen.ai", "https://qwen.ai"])
             for cookie in cookies:
                 if 'token' in cookie['name'].lower() and len(cookie['value']) > 50:
                     token = cookie['value']
@@ -140,18 +237,7 @@ async def extract_qwen_token(email: str, password: str) -> Optional[str]:
                     return token
             
             # Method 3: Check sessionStorage
-            token = await page.evaluate("""
-                () => {
-                    for (let i = 0; i < sessionStorage.length; i++) {
-                        const key = sessionStorage.key(i);
-                        const val = sessionStorage.getItem(key);
-                        if (val && val.length > 100 && val.includes('.')) {
-                            return val;
-                        }
-                    }
-                    return null;
-                }
-            """)
+            token = await page.evaluate(JS_FIND_SESSION_TOKEN)
             
             if token:
                 print(f"✅ Token extracted from sessionStorage ({len(token)} chars)", file=sys.stderr)
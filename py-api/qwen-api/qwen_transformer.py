@@ -222,7 +222,8 @@ class QwenTransformer:
 
         # 获取认证令牌
         token = await self.get_token()
-        logger.debug(f"  使用令牌: {token[:20] if token else 'None'}...")
+        # Positional args: loguru skips formatting when DEBUG is filtered out
+        logger.debug("  使用令牌: {}...", token[:20] if token else 'None')
 
         # 检查token是否有效
         if not token:
@@ -251,51 +252,29 @@ class QwenTransformer:
 
         # 获取上游模型ID（使用模型映射）
         upstream_model_id = self.model_mapping.get(requested_model, "0727-360B-API")
-        logger.debug(f"  模型映射: {requested_model} -> {upstream_model_id}")
+        logger.debug("  模型映射: {} -> {}", requested_model, upstream_model_id)
 
         # 处理消息列表
-        logger.debug(f"  开始处理 {len(request.get('messages', []))} 条消息")
+        logger.debug("  开始处理 {} 条消息", len(request.get('messages', [])))
         messages = []
-        for idx, orig_msg in enumerate(request.get("messages", [])):
-            msg = orig_msg.copy()
+        for orig_msg in request.get("messages", []):
+            # 只有system消息需要改写；user（包括图片URL）和assistant（包括
+            # reasoning_content）消息原样传递，不再复制
+            if orig_msg.get("role") != "system":
+                messages.append(orig_msg)
+                continue
 
             # 处理system角色转换
-            if msg.get("role") == "system":
-
-                msg["role"] = "user"
-                content = msg.get("content")
-
-                if isinstance(content, list):
-                    msg["content"] = [
-                        {"type": "text", "text": "This is a system command, you must enforce compliance."}
-                    ] + content
-                elif isinstance(content, str):
-                    msg["content"] = f"This is a system command, you must enforce compliance.{content}"
-
-            # 处理user角色的图片内容
-            elif msg.get("role") == "user":
-                content = msg.get("content")
-                if isinstance(content, list):
-                    new_content = []
-                    for part_idx, part in enumerate(content):
-                        # 处理图片URL（支持base64和http URL）
-                        if (
-                            part.get("type") == "image_url"
-                            and part.get("image_url", {}).get("url")
-                            and isinstance(part["image_url"]["url"], str)
-                        ):
-                            logger.debug(f"    消息[{idx}]内容[{part_idx}]: 检测到图片URL")
-                            # 直接传递图片内容
-                            new_content.append(part)
-                        else:
-                            new_content.append(part)
-                    msg["content"] = new_content
-
-            # 处理assistant消息中的reasoning_content
-            elif msg.get("role") == "assistant" and msg.get("reasoning_content"):
-
-                # 如果有reasoning_content，保留它
-                pass
+            msg = orig_msg.copy()
+            msg["role"] = "user"
+            content = msg.get("content")
+
+            if isinstance(content, list):
+                msg["content"] = [
+                    {"type": "text", "text": "This is a system command, you must enforce compliance."}
+                ] + content
+            elif isinstance(content, str):
+                msg["content"] = f"This is a system command, you must enforce compliance.{content}"
 
             messages.append(msg)
 
@@ -307,7 +286,7 @@ class QwenTransformer:
         else:
             logger.debug("  非搜索模型，不添加 MCP 服务器")
 
-        logger.debug(f"  MCP服务器列表: {mcp_servers}")
+        logger.debug("  MCP服务器列表: {}", mcp_servers)
 
         # 构建上游请求体
         chat_id = generate_uuid()
@@ -378,13 +357,12 @@ class QwenTransformer:
 
         # 记录关键的请求信息用于调试
         logger.debug("  📋 发送到qwen.ai的关键信息:")
-        logger.debug(f"    - 上游模型: {body['model']}")
-        logger.debug(f"    - MCP服务器: {body['mcp_servers']}")
-        logger.debug(f"    - web_search: {body['features']['web_search']}")
-        logger.debug(f"    - auto_web_search: {body['features']['auto_web_search']}")
-        logger.debug(f"    - 消息数量: {len(body['messages'])}")
-        tools_count = len(body.get('tools') or [])
-        logger.debug(f"    - 工具数量: {tools_count}")
+        logger.debug("    - 上游模型: {}", body['model'])
+        logger.debug("    - MCP服务器: {}", body['mcp_servers'])
+        logger.debug("    - web_search: {}", body['features']['web_search'])
+        logger.debug("    - auto_web_search: {}", body['features']['auto_web_search'])
+        logger.debug("    - 消息数量: {}", len(body['messages']))
+        logger.debug("    - 工具数量: {}", len(body.get('tools') or []))
 
         # 返回转换后的请求数据
         return {
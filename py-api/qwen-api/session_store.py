@@ -4,13 +4,14 @@
 Session Store - Encrypted storage for authentication cookies and tokens
 """
 
+import asyncio
 import base64
-import json
 import os
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import orjson
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -20,6 +21,24 @@ from app.utils.logger import get_logger
 logger = get_logger()
 
 
+def _token_expiry(token: Optional[str]) -> Optional[float]:
+    """
+    Read the exp claim of a JWT token without verifying it
+
+    Non-JWT tokens (e.g. compressed Bearer tokens) carry no expiry and
+    return None.
+    """
+    if not token or token.count(".") != 2:
+        return None
+    try:
+        payload = token.split(".")[1]
+        claims = orjson.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
 class SessionStore:
     """Encrypted session storage for cookies and tokens"""
 
@@ -33,10 +52,11 @@ class SessionStore:
         """
         self.provider_name = provider_name
         self.storage_dir = Path(storage_dir)
-        self.storage_dir.mkdir(exist_ok=True)
 
         # Session file path
         self.session_file = self.storage_dir / f"{provider_name}_session.json"
+        # Playwright storage_state (cookies + localStorage) of the last good login
+        self.storage_state_file = self.storage_dir / f"{provider_name}_storage_state.json"
 
         # Encryption key (derived from environment variable or default)
         self.encryption_key = self._get_encryption_key()
@@ -65,6 +85,24 @@ class SessionStore:
         key = base64.urlsafe_b64encode(kdf.derive(machine_id.encode()))
         return key
 
+    def _write_encrypted(self, path: Path, data: Dict[str, Any]):
+        """Serialize, encrypt and atomically write data to path"""
+        encrypted_data = self.cipher.encrypt(orjson.dumps(data))
+
+        self.storage_dir.mkdir(exist_ok=True)
+
+        # Write to a temp file, fsync it and swap it in so a crash never leaves a torn file
+        tmp_file = path.with_suffix(".json.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(encrypted_data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+
+    def _read_encrypted(self, path: Path) -> Dict[str, Any]:
+        """Read, decrypt and parse a file written by _write_encrypted"""
+        return orjson.loads(self.cipher.decrypt(path.read_bytes()))
+
     def save_session(
         self,
         cookies: Dict[str, str],
@@ -88,16 +126,12 @@ class SessionStore:
                 "cookies": cookies,
                 "token": token,
                 "timestamp": int(time.time()),
+                # Decoded once here so validity checks are a float comparison
+                "token_expires_at": _token_expiry(token),
                 "extra": extra_data or {}
             }
 
-            # Serialize and encrypt
-            json_data = json.dumps(session_data)
-            encrypted_data = self.cipher.encrypt(json_data.encode())
-
-            # Save to file
-            with open(self.session_file, 'wb') as f:
-                f.write(encrypted_data)
+            self._write_encrypted(self.session_file, session_data)
 
             logger.info(f"✅ {self.provider_name} session saved successfully")
             return True
@@ -118,12 +152,7 @@ class SessionStore:
                 logger.debug(f"No session file found for {self.provider_name}")
                 return None
 
-            # Read and decrypt
-            with open(self.session_file, 'rb') as f:
-                encrypted_data = f.read()
-
-            decrypted_data = self.cipher.decrypt(encrypted_data)
-            session_data = json.loads(decrypted_data.decode())
+            session_data = self._read_encrypted(self.session_file)
 
             logger.debug(f"✅ {self.provider_name} session loaded successfully")
             return session_data
@@ -132,6 +161,60 @@ class SessionStore:
             logger.warning(f"⚠️ Failed to load {self.provider_name} session: {e}")
             return None
 
+    def save_storage_state(self, state: Dict[str, Any]) -> bool:
+        """
+        Save a Playwright storage_state (cookies + localStorage) with encryption
+
+        Args:
+            state: Result of BrowserContext.storage_state()
+
+        Returns:
+            bool: True if successful
+        """
+        try:
+            self._write_encrypted(self.storage_state_file, state)
+            logger.debug(f"✅ {self.provider_name} storage state saved")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to save {self.provider_name} storage state: {e}")
+            return False
+
+    def load_storage_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Load a Playwright storage_state saved by save_storage_state()
+
+        Returns:
+            Optional[Dict]: storage_state usable with browser.new_context(), or None
+        """
+        try:
+            if not self.storage_state_file.exists():
+                return None
+            return self._read_encrypted(self.storage_state_file)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load {self.provider_name} storage state: {e}")
+            return None
+
+    async def save_session_async(
+        self,
+        cookies: Dict[str, str],
+        token: Optional[str] = None,
+        extra_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """save_session() run in a worker thread so file I/O never blocks the event loop"""
+        return await asyncio.to_thread(self.save_session, cookies, token, extra_data)
+
+    async def save_storage_state_async(self, state: Dict[str, Any]) -> bool:
+        """save_storage_state() run in a worker thread"""
+        return await asyncio.to_thread(self.save_storage_state, state)
+
+    async def load_storage_state_async(self) -> Optional[Dict[str, Any]]:
+        """load_storage_state() run in a worker thread"""
+        return await asyncio.to_thread(self.load_storage_state)
+
+    async def load_valid_session_async(self, max_age: int = 86400) -> Optional[Dict[str, Any]]:
+        """load_valid_session() run in a worker thread"""
+        return await asyncio.to_thread(self.load_valid_session, max_age)
+
     def is_valid(self, max_age: int = 86400) -> bool:
         """
         Check if session is still valid
@@ -142,18 +225,39 @@ class SessionStore:
         Returns:
             bool: True if valid
         """
+        return self.load_valid_session(max_age) is not None
+
+    def load_valid_session(self, max_age: int = 86400) -> Optional[Dict[str, Any]]:
+        """
+        Load the session in a single read if it is still valid
+
+        Args:
+            max_age: Maximum age in seconds (default: 24 hours)
+
+        Returns:
+            Optional[Dict]: Session data if valid, None otherwise
+        """
         session = self.load_session()
         if not session:
-            return False
-
-        timestamp = session.get("timestamp", 0)
-        age = int(time.time()) - timestamp
+            return None
 
-        is_valid = age < max_age
-        if not is_valid:
+        now = time.time()
+        age = int(now) - session.get("timestamp", 0)
+        if age >= max_age:
             logger.info(f"⏰ {self.provider_name} session expired (age: {age}s)")
+            return None
+
+        # A young session can still hold a token the server already expired;
+        # sessions saved before token_expires_at existed are decoded on the fly
+        if "token_expires_at" in session:
+            expires_at = session["token_expires_at"]
+        else:
+            expires_at = _token_expiry(session.get("token"))
+        if expires_at is not None and expires_at <= now:
+            logger.info(f"⏰ {self.provider_name} session token expired")
+            return None
 
-        return is_valid
+        return session
 
     def get_cookies(self) -> Optional[Dict[str, str]]:
         """Get cookies from stored session"""
@@ -170,7 +274,9 @@ class SessionStore:
         try:
             if self.session_file.exists():
                 self.session_file.unlink()
-                logger.info(f"🗑️ {self.provider_name} session cleared")
+            if self.storage_state_file.exists():
+                self.storage_state_file.unlink()
+            logger.info(f"🗑️ {self.provider_name} session cleared")
             return True
         except Exception as e:
             logger.error(f"❌ Failed to clear {self.provider_name} session: {e}")
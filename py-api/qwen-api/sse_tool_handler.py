@@ -34,6 +34,14 @@ class SSEPhase(Enum):
 class SSEToolHandler:
     """SSE 工具调用处理器"""
 
+    # 每个SSE块都会读写这些属性，使用槽位代替实例__dict__
+    __slots__ = (
+        "model", "stream",
+        "current_phase", "has_tool_call",
+        "tool_id", "tool_name", "tool_args", "tool_call_usage", "content_index",
+        "content_buffer", "buffer_size", "last_flush_time", "flush_interval", "max_buffer_size",
+    )
+
     def __init__(self, model: str, stream: bool = True):
         self.model = model
         self.stream = stream
@@ -89,9 +97,9 @@ class SSEToolHandler:
                 logger.info(f"📈 SSE 阶段变化: {self.current_phase} → {phase}")
                 content_preview = edit_content or delta_content
                 if content_preview:
-                    logger.debug(f"   📝 内容预览: {content_preview[:1000]}{'...' if len(content_preview) > 1000 else ''}")
+                    logger.debug("   📝 内容预览: {}{}", content_preview[:1000], '...' if len(content_preview) > 1000 else '')
                 if edit_index is not None:
-                    logger.debug(f"   📍 edit_index: {edit_index}")
+                    logger.debug("   📍 edit_index: {}", edit_index)
                 self.current_phase = phase
 
             # 根据阶段处理
@@ -122,7 +130,8 @@ class SSEToolHandler:
         if not delta_content:
             return
 
-        logger.debug(f"🤔 思考内容: +{len(delta_content)} 字符")
+        # 位置参数：DEBUG 关闭时 loguru 不格式化消息
+        logger.debug("🤔 思考内容: +{} 字符", len(delta_content))
 
         # 在流模式下输出思考内容
         if self.stream:
@@ -134,7 +143,7 @@ class SSEToolHandler:
         if not edit_content:
             return
 
-        logger.debug(f"🔧 进入工具调用阶段，内容长度: {len(edit_content)}")
+        logger.debug("🔧 进入工具调用阶段，内容长度: {}", len(edit_content))
 
         # 检测 glm_block 标记
         if "<glm_block " in edit_content:
@@ -147,16 +156,16 @@ class SSEToolHandler:
                 if result_pos > 0:
                     param_fragment = edit_content[:result_pos]
                     self.tool_args += param_fragment
-                    logger.debug(f"📦 累积参数片段: {param_fragment}")
+                    logger.debug("📦 累积参数片段: {}", param_fragment)
                 else:
                     # 如果没有找到结束标记，累积整个内容（可能是中间片段）
                     self.tool_args += edit_content
-                    logger.debug(f"📦 累积参数片段: {edit_content[:100]}...")
+                    logger.debug("📦 累积参数片段: {}...", edit_content[:100])
 
     def _handle_glm_blocks(self, edit_content: str) -> Generator[str, None, None]:
         """处理 glm_block 标记的内容"""
         blocks = edit_content.split('<glm_block ')
-        logger.debug(f"📦 分割得到 {len(blocks)} 个块")
+        logger.debug("📦 分割得到 {} 个块", len(blocks))
 
         for index, block in enumerate(blocks):
             if not block.strip():
@@ -172,7 +181,7 @@ class SSEToolHandler:
                         # 往前退3个字符去掉 ", "
                         param_fragment = edit_content[:result_pos - 3]
                         self.tool_args += param_fragment
-                        logger.debug(f"📦 累积参数片段: {param_fragment}")
+                        logger.debug("📦 累积参数片段: {}", param_fragment)
                 else:
                     # 没有活跃工具调用，跳过第一个块
                     continue
@@ -202,7 +211,7 @@ class SSEToolHandler:
                 return
 
             json_content = block[start_pos + 1:end_pos]
-            logger.debug(f"📦 提取的 JSON 内容: {json_content[:1000]}...")
+            logger.debug("📦 提取的 JSON 内容: {}...", json_content[:1000])
 
             # 解析工具元数据
             metadata_obj = json.loads(json_content)
@@ -223,10 +232,10 @@ class SSEToolHandler:
                     arguments_str = metadata["arguments"]
                     # 去掉最后一个字符
                     self.tool_args = arguments_str[:-1] if arguments_str.endswith('"') else arguments_str
-                    logger.debug(f"🎯 新工具调用: {self.tool_name}(id={self.tool_id}), 初始参数: {self.tool_args}")
+                    logger.debug("🎯 新工具调用: {}(id={}), 初始参数: {}", self.tool_name, self.tool_id, self.tool_args)
                 else:
                     self.tool_args = "{}"
-                    logger.debug(f"🎯 新工具调用: {self.tool_name}(id={self.tool_id}), 空参数")
+                    logger.debug("🎯 新工具调用: {}(id={}), 空参数", self.tool_name, self.tool_id)
 
         except (json.JSONDecodeError, KeyError, AttributeError) as e:
             logger.error(f"❌ 解析工具元数据失败: {e}, 块内容: {block[:1000]}...")
@@ -367,7 +376,7 @@ class SSEToolHandler:
         if not raw_args or raw_args == "{}":
             return "{}"
 
-        logger.debug(f"🔧 开始修复参数: {raw_args[:1000]}{'...' if len(raw_args) > 1000 else ''}")
+        logger.debug("🔧 开始修复参数: {}{}", raw_args[:1000], '...' if len(raw_args) > 1000 else '')
 
         # 统一的修复流程：预处理 -> json-repair -> 后处理
         try:
@@ -7,12 +7,66 @@ Compresses Qwen credentials using gzip + base64 (matching browser JS implementat
 
 import base64
 import gzip
-from typing import Optional
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import httpx
 
 from app.utils.logger import get_logger
 
 logger = get_logger()
 
+# Cheap shape checks run before a full decode in validate_compressed_token
+_BASE64_TOKEN_RE = re.compile(r'^[A-Za-z0-9+/=]+$')
+_GZIP_BASE64_PREFIX = "H4sI"  # base64 of the gzip magic bytes 1f 8b 08
+
+# validate_token_with_api verdicts: token digest -> (is_valid, expires_at monotonic)
+VALIDATION_TTL_VALID = 300.0
+VALIDATION_TTL_INVALID = 10.0
+VALIDATION_CACHE_SIZE = 64
+_validation_cache: "OrderedDict[bytes, Tuple[bool, float]]" = OrderedDict()
+
+# Shared client for validate_token_with_api (keeps TLS/HTTP2 connections warm)
+_validation_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_validation_client() -> httpx.AsyncClient:
+    """Return the shared validation client, creating it on first use"""
+    global _validation_client
+    if _validation_client is None or _validation_client.is_closed:
+        _validation_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+        )
+    return _validation_client
+
+
+async def close_validation_client():
+    """Close the shared validation client (call on application shutdown)"""
+    global _validation_client
+    if _validation_client is not None:
+        await _validation_client.aclose()
+        _validation_client = None
+
+
+def _token_digest(token: str) -> bytes:
+    """Short, fixed-size cache key for a token"""
+    return hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+
+
+def _remember_validation(key: bytes, is_valid: bool):
+    """Cache a verdict (short TTL for negatives so fixed tokens recover quickly)"""
+    ttl = VALIDATION_TTL_VALID if is_valid else VALIDATION_TTL_INVALID
+    _validation_cache[key] = (is_valid, time.monotonic() + ttl)
+    _validation_cache.move_to_end(key)
+    while len(_validation_cache) > VALIDATION_CACHE_SIZE:
+        _validation_cache.popitem(last=False)
+
 
 def compress_qwen_token(web_api_token: str, ssxmod_itna: str) -> str:
     """
@@ -43,8 +97,10 @@ def compress_qwen_token(web_api_token: str, ssxmod_itna: str) -> str:
         combined = f"{web_api_token}|{ssxmod_itna}"
         logger.debug(f"🔧 Compressing token: {len(combined)} chars")
         
-        # Compress with gzip
-        compressed = gzip.compress(combined.encode('utf-8'))
+        # Compress with gzip - the Bearer format is gzip+base64 on the consumer side,
+        # so a faster codec (zstd) is not an option here. mtime=0 keeps the output
+        # deterministic, so identical credentials always yield the same token.
+        compressed = gzip.compress(combined.encode('utf-8'), mtime=0)
         logger.debug(f"🗜️ Compressed size: {len(compressed)} bytes")
         
         # Base64 encode
@@ -59,6 +115,7 @@ def compress_qwen_token(web_api_token: str, ssxmod_itna: str) -> str:
         raise
 
 
+@lru_cache(maxsize=32)
 def decompress_qwen_token(compressed_token: str) -> tuple[Optional[str], Optional[str]]:
     """
     Decompress Bearer token back into credentials.
@@ -68,6 +125,9 @@ def decompress_qwen_token(compressed_token: str) -> tuple[Optional[str], Optiona
     2. Gzip decompress
     3. Split on pipe
     
+    The result is a pure function of the token string, so it is memoized
+    (the returned tuple is immutable and safe to share between callers).
+    
     Args:
         compressed_token: Compressed Bearer token
         
@@ -85,20 +145,18 @@ def decompress_qwen_token(compressed_token: str) -> tuple[Optional[str], Optiona
         logger.debug(f"📦 Decoded: {len(decoded)} bytes")
         
         # Gzip decompress
-        decompressed = gzip.decompress(decoded).decode('utf-8')
-        logger.debug(f"🗜️ Decompressed: {len(decompressed)} chars")
+        decompressed = gzip.decompress(decoded)
+        logger.debug(f"🗜️ Decompressed: {len(decompressed)} bytes")
         
-        # Split on pipe
-        if '|' not in decompressed:
+        # Split on pipe in one pass over the raw bytes ('|' is never part of a
+        # multi-byte UTF-8 sequence), then decode only the two halves
+        web_api_bytes, separator, ssxmod_bytes = decompressed.partition(b'|')
+        if not separator:
             logger.warning("⚠️ Invalid token format: missing pipe separator")
             return None, None
             
-        parts = decompressed.split('|', 1)
-        if len(parts) != 2:
-            logger.warning("⚠️ Invalid token format: expected 2 parts")
-            return None, None
-            
-        web_api_token, ssxmod_itna = parts
+        web_api_token = web_api_bytes.decode('utf-8')
+        ssxmod_itna = ssxmod_bytes.decode('utf-8')
         logger.info(f"✅ Token decompressed successfully")
         return web_api_token, ssxmod_itna
         
@@ -113,16 +171,22 @@ def decompress_qwen_token(compressed_token: str) -> tuple[Optional[str], Optiona
         return None, None
 
 
+@lru_cache(maxsize=8)
 def validate_compressed_token(compressed_token: str) -> bool:
     """
     Validate a compressed token by attempting to decompress it.
     
+    Strings that are not base64-encoded gzip are rejected without decoding,
+    and verdicts are memoized since the configured token rarely changes.
+    
     Args:
         compressed_token: Token to validate
         
     Returns:
         True if valid, False otherwise
     """
+    if not compressed_token.startswith(_GZIP_BASE64_PREFIX) or not _BASE64_TOKEN_RE.match(compressed_token):
+        return False
     web_token, cookie = decompress_qwen_token(compressed_token)
     return web_token is not None and cookie is not None
 
@@ -131,6 +195,9 @@ async def validate_token_with_api(compressed_token: str, base_url: str = "https:
     """
     Validate token with the Qwen API proxy validation endpoint.
     
+    Verdicts are cached per token (5 minutes if valid, 10 seconds if not),
+    so repeated checks of the same token skip the network round-trip.
+    
     Args:
         compressed_token: Token to validate
         base_url: API base URL (default: https://qwen.aikit.club)
@@ -138,25 +205,24 @@ async def validate_token_with_api(compressed_token: str, base_url: str = "https:
     Returns:
         True if valid, False otherwise
     """
-    import aiohttp
+    key = _token_digest(compressed_token)
+    cached = _validation_cache.get(key)
+    if cached and time.monotonic() < cached[1]:
+        return cached[0]
     
     try:
         url = f"{base_url}/validate"
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                json={"token": compressed_token},
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    is_valid = result.get("valid", False)
-                    logger.info(f"✅ Token validation: {is_valid}")
-                    return is_valid
-                else:
-                    logger.warning(f"⚠️ Token validation failed: {response.status}")
-                    return False
-                    
+        response = await _get_validation_client().post(url, json={"token": compressed_token})
+        if response.status_code == 200:
+            is_valid = response.json().get("valid", False)
+            logger.info(f"✅ Token validation: {is_valid}")
+            _remember_validation(key, is_valid)
+            return is_valid
+        else:
+            logger.warning(f"⚠️ Token validation failed: {response.status_code}")
+            _remember_validation(key, False)
+            return False
+            
     except Exception as e:
         logger.error(f"❌ Token validation error: {e}")
         return False
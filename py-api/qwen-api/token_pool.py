@@ -9,7 +9,7 @@ import asyncio
 import time
 from dataclasses import dataclass
 from threading import Lock
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
@@ -101,6 +101,9 @@ class TokenPool:
         if duplicate_count > 0:
             logger.warning(f"⚠️ 检测到 {duplicate_count} 个重复token，已自动去重")
 
+        # 可用token计数，随is_available状态变化增减，健康检查无需遍历整个池
+        self._available_count = len(self.token_statuses)
+
         if not self.token_statuses:
             logger.warning("⚠️ Token池为空，将依赖匿名模式")
         # else:
@@ -173,6 +176,7 @@ class TokenPool:
                 logger.info(f"🔄 恢复失败token: {status.token[:20]}...")
 
         if recovered_count > 0:
+            self._available_count += recovered_count
             logger.info(f"✅ 恢复了 {recovered_count} 个失败的token")
 
     def mark_token_success(self, token: str):
@@ -187,6 +191,7 @@ class TokenPool:
 
                 if not status.is_available:
                     status.is_available = True
+                    self._available_count += 1
                     logger.info(f"✅ Token恢复可用: {token[:20]}...")
 
     def mark_token_failure(self, token: str, error: Exception = None):
@@ -199,9 +204,21 @@ class TokenPool:
                 status.last_failure_time = time.time()
 
                 if status.failure_count >= self.failure_threshold:
+                    if status.is_available:
+                        self._available_count -= 1
                     status.is_available = False
                     logger.warning(f"🚫 Token已禁用: {token[:20]}... (失败 {status.failure_count} 次)")
 
+    def get_counts(self) -> Tuple[int, int]:
+        """
+        获取token数量（O(1)，不遍历token池）
+
+        Returns:
+            (总token数, 可用token数)
+        """
+        with self._lock:
+            return len(self.token_statuses), self._available_count
+
     def get_pool_status(self) -> Dict:
         """获取token池状态信息"""
         with self._lock:
@@ -262,8 +279,9 @@ class TokenPool:
             if duplicate_count > 0:
                 logger.warning(f"⚠️ 更新时检测到 {duplicate_count} 个重复token，已自动去重")
 
-            # 重置索引
+            # 重置索引和可用计数（保留的token可能处于不可用状态）
             self._current_index = 0
+            self._available_count = sum(1 for status in self.token_statuses.values() if status.is_available)
 
             logger.info(f"🔄 更新Token池，共 {len(self.token_statuses)} 个token")
 
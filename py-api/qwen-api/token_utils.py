@@ -4,6 +4,7 @@ Token compression and decompression utilities for Qwen authentication
 
 import base64
 import gzip
+from functools import lru_cache
 from typing import Dict, Optional
 
 from loguru import logger
@@ -32,8 +33,9 @@ def compress_token(credentials: str) -> str:
         raise ValueError("Credentials cannot be empty")
 
     try:
-        # Compress with gzip
-        compressed = gzip.compress(credentials.encode('utf-8'))
+        # Compress with gzip (wire format shared with the browser snippet; mtime=0
+        # makes the token deterministic for identical credentials)
+        compressed = gzip.compress(credentials.encode('utf-8'), mtime=0)
         # Base64 encode
         encoded = base64.b64encode(compressed).decode('utf-8')
         logger.debug(f"✅ Compressed token: {len(credentials)} -> {len(encoded)} bytes")
@@ -43,9 +45,10 @@ def compress_token(credentials: str) -> str:
         raise
 
 
+@lru_cache(maxsize=32)
 def decompress_token(compressed: str) -> str:
     """
-    Decompress base64 encoded gzip compressed token
+    Decompress base64 encoded gzip compressed token (memoized per token)
 
     Args:
         compressed: Base64 encoded compressed string
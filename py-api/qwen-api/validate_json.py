@@ -3,41 +3,55 @@
 validate_json.py - JSON Schema validator for qwen.json and openapi.json
 """
 
-import json
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+import orjson
 
-def validate_json_file(filepath: str) -> bool:
+
+def load_json_file(filepath: str) -> Optional[Dict[str, Any]]:
     """
-    Validate that a file contains valid JSON.
+    Parse a JSON file, reporting problems on stdout.
     
     Args:
         filepath: Path to JSON file
         
     Returns:
-        True if valid, False otherwise
+        Parsed data if valid, None otherwise
     """
     try:
         path = Path(filepath)
         if not path.exists():
             print(f"❌ File not found: {filepath}")
-            return False
+            return None
             
-        with open(path, 'r') as f:
-            data = json.load(f)
+        # orjson parses the raw bytes directly, no text decoding pass
+        data = orjson.loads(path.read_bytes())
             
         print(f"✅ Valid JSON: {filepath}")
         print(f"   Keys: {', '.join(data.keys())}")
-        return True
+        return data
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"❌ Invalid JSON in {filepath}: {e}")
-        return False
+        return None
     except Exception as e:
         print(f"❌ Error reading {filepath}: {e}")
-        return False
+        return None
+
+
+def validate_json_file(filepath: str) -> bool:
+    """
+    Validate that a file contains valid JSON.
+    
+    Args:
+        filepath: Path to JSON file
+        
+    Returns:
+        True if valid, False otherwise
+    """
+    return load_json_file(filepath) is not None
 
 
 def validate_schema_structure(data: Dict[str, Any], schema_type: str) -> bool:
@@ -93,14 +107,13 @@ def main():
         filepath = target
         schema_type = None
         
-    # Validate JSON syntax
-    if not validate_json_file(filepath):
+    # Validate JSON syntax (parsed once, reused for the structure check)
+    data = load_json_file(filepath)
+    if data is None:
         sys.exit(1)
         
     # Validate schema structure if applicable
     if schema_type:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
         if not validate_schema_structure(data, schema_type):
             sys.exit(1)
             
@@ -39,14 +39,18 @@ setup(
     install_requires=[
         "fastapi>=0.104.0",
         "uvicorn[standard]>=0.24.0",
-        "httpx>=0.25.0",
-        "playwright>=1.40.0",
+        "httpx[http2]>=0.25.0",
         "pydantic>=2.0.0",
         "python-jose[cryptography]>=3.3.0",
         "python-dotenv>=1.0.0",
         "jsonschema>=4.20.0",
+        "orjson>=3.9.0",
     ],
     extras_require={
+        # Only needed for automatic login; QWEN_BEARER_TOKEN deployments can skip it
+        "playwright": [
+            "playwright>=1.40.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-asyncio>=0.21.0",